@@ -1,13 +1,30 @@
 
+import argparse
 import sys
 import os
 
 # Add src to path
 sys.path.append(os.path.join(os.path.dirname(__file__), "src"))
 
+from src.cache import LevelCache
 from src.game import Game
+from src.pathfinding import STRATEGIES
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Labyrinthe Aventure")
+    parser.add_argument("--seed", type=int, help="graine de la serie de niveaux (niveaux reproductibles)")
+    parser.add_argument("--cache", help="dossier du cache des niveaux generes")
+    parser.add_argument("--cache-size", type=int, default=64, help="taille max du cache en Mo")
+    parser.add_argument("--replays", help="dossier ou enregistrer les replays des niveaux gagnes")
+    parser.add_argument("--hint", choices=["auto"] + list(STRATEGIES),
+                        help="moteur de recherche des indices (defaut: distances precalculees, "
+                             "auto: index d'arbre pour les labyrinthes parfaits)")
+    return parser.parse_args(argv)
 
 def main():
+    args = parse_args()
+    cache = LevelCache(args.cache, args.cache_size * 1024 * 1024) if args.cache else None
+
     print("=" * 50)
     print("   Labyrinthe Aventure")
     print("=" * 50)
@@ -32,10 +49,12 @@ def main():
                 f.write("#######\n#x... #\n#.#.#.#\n#...#.X\n#######\n")
             filename = default_file
 
-        app = Game(maze_file=filename)
+        app = Game(maze_file=filename, seed=args.seed, cache=cache, hint_strategy=args.hint,
+                   replay_dir=args.replays)
     else:
         print("Generation d'un labyrinthe aleatoire...")
-        app = Game()
+        app = Game(seed=args.seed, cache=cache, hint_strategy=args.hint,
+                   replay_dir=args.replays)
     
     app.run()
 
@@ -0,0 +1,248 @@
+"""
+Reproducible performance benchmarks.
+
+    python -m src.bench --json results.json
+    python -m src.bench --quick --compare results.json
+
+Every case uses fixed seeds. Each case runs a few warmup calls, then
+`repeat` timed samples (fast calls are looped within a sample); the
+reported median has the measured cost of an empty call subtracted.
+Peak memory comes from a separate tracemalloc run so it does not skew
+the timings. --compare flags cases slower than a previous JSON run by
+more than --threshold. draw_maze targets a null canvas, so it measures
+the Python side of rendering without needing a display.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from . import fastbfs
+from .generator import MazeGenerator
+from .maze import Maze
+from .solver import Solver
+
+SEED = 12345
+LEVELS = (1, 5, 10, 15)
+LOAD_SIZES = ((501, 501), (2001, 2001))
+OPEN_SIZES = ((201, 201), (1001, 1001))
+
+
+class _NullCanvas:
+    """Stand-in Tk canvas that only hands out item ids."""
+
+    def __init__(self):
+        self._next = 0
+
+    def _item(self, *args, **kwargs):
+        self._next += 1
+        return self._next
+
+    create_rectangle = create_oval = _item
+
+    def _noop(self, *args, **kwargs):
+        pass
+
+    delete = itemconfigure = coords = tag_lower = tag_raise = _noop
+
+
+class _NullScreen:
+    def __init__(self, canvas):
+        self.canvas = canvas
+
+    def getcanvas(self):
+        return self.canvas
+
+    def _noop(self, *args, **kwargs):
+        pass
+
+    bgcolor = tracer = update = _noop
+
+
+def _offscreen_ui():
+    """A GameUI whose draw_maze targets a null canvas (no display needed)."""
+    from .ui import GameUI
+
+    canvas = _NullCanvas()
+    ui = GameUI(None, None, canvas=canvas, screen=_NullScreen(canvas))
+    ui.cell_size = 10
+    return ui
+
+
+def _generated_maze(level):
+    rows, cols = MazeGenerator.difficulty_settings(level)
+    grid, start_pos, end_pos = MazeGenerator.generate(rows, cols, seed=SEED + level)
+    return grid, Maze(grid=grid, start_pos=start_pos, end_pos=end_pos)
+
+
+def _sample(fn, number):
+    t0 = time.perf_counter()
+    for _ in range(number):
+        fn()
+    return (time.perf_counter() - t0) / number
+
+
+def measure(fn, repeat=7, warmup=2, min_time=0.005):
+    """
+    Time fn(); returns (per-call timings, overhead-corrected median).
+    Fast calls are looped so that each sample lasts at least min_time.
+    """
+    for _ in range(warmup):
+        fn()
+    number = 1
+    while _sample(fn, number) * number < min_time and number < 1 << 20:
+        number *= 2
+    timings = [_sample(fn, number) for _ in range(repeat)]
+    noop = lambda: None
+    overhead = statistics.median(_sample(noop, number) for _ in range(repeat))
+    median = max(statistics.median(timings) - overhead, 1e-9)
+    return timings, median
+
+
+def peak_memory(fn):
+    """Peak bytes allocated by one call of fn()."""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def build_cases(quick=False, tmpdir=None):
+    """Yield (name, params, fn) for every benchmark case."""
+    levels = LEVELS[:2] if quick else LEVELS
+    for level in levels:
+        rows, cols = MazeGenerator.difficulty_settings(level)
+        params = {"level": level, "rows": rows, "cols": cols}
+        grid, maze = _generated_maze(level)
+
+        yield ("generate", params,
+               lambda r=rows, c=cols, s=SEED + level: MazeGenerator.generate(r, c, seed=s))
+        yield ("farthest_point", params,
+               lambda g=grid, r=rows, c=cols: MazeGenerator._farthest_point(g, (1, 1), r, c))
+
+        def shortest_path_cold(m=maze):
+            m._exit_field = None
+            m.shortest_path(m.start_pos, m.end_pos)
+        yield ("shortest_path_cold", params, shortest_path_cold)
+        yield ("shortest_path_warm", params,
+               lambda m=maze: m.shortest_path(m.start_pos, m.end_pos))
+
+        def corridor_cold(m=maze):
+            m._corridor_graph = None
+            m.shortest_path(m.start_pos, m.end_pos, strategy="corridor")
+        yield ("corridor_cold", params, corridor_cold)
+        yield ("corridor_warm", params,
+               lambda m=maze: m.shortest_path(m.start_pos, m.end_pos, strategy="corridor"))
+
+        def tree_cold(m=maze):
+            m._tree_index_key = None
+            m.shortest_path(m.start_pos, m.end_pos, strategy="tree")
+        yield ("tree_cold", params, tree_cold)
+        yield ("tree_warm", params,
+               lambda m=maze: m.shortest_path(m.start_pos, m.end_pos, strategy="tree"))
+        yield ("solve", params,
+               lambda m=maze: sum(1 for _ in Solver(m).solve_generator(m.start_pos)))
+
+        ui = _offscreen_ui()
+        yield ("draw_maze", params, lambda u=ui, m=maze: u.draw_maze(m))
+
+    if tmpdir is not None:
+        for rows, cols in LOAD_SIZES[:1] if quick else LOAD_SIZES:
+            path = os.path.join(tmpdir, f"maze_{rows}x{cols}.txt")
+            MazeGenerator.stream_to_file(path, rows, cols, seed=SEED)
+            yield ("load_maze", {"rows": rows, "cols": cols}, lambda p=path: Maze(p))
+
+    # Open rooms: wide BFS frontiers, where the NumPy backend pays off
+    for rows, cols in OPEN_SIZES[:1] if quick else OPEN_SIZES:
+        grid = [[1] * cols] + [[1] + [0] * (cols - 2) + [1] for _ in range(rows - 2)] + [[1] * cols]
+        maze = Maze(grid=grid, start_pos=(1, 1), end_pos=(rows - 2, cols - 2))
+        yield ("distance_map_open", {"rows": rows, "cols": cols, "numpy": fastbfs.np is not None},
+               lambda m=maze: fastbfs.distance_map(m.cells, m.stride, m.index(*m.end_pos)))
+
+
+def run(quick=False, only=None, repeat=None):
+    repeat = repeat or (3 if quick else 7)
+    results = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for name, params, fn in build_cases(quick, tmpdir):
+            if only and not any(pattern in name for pattern in only):
+                continue
+            timings, median = measure(fn, repeat=repeat)
+            results.append({
+                "name": name,
+                "params": params,
+                "median_s": median,
+                "min_s": min(timings),
+                "max_s": max(timings),
+                "ops_per_s": 1 / median,
+                "peak_bytes": peak_memory(fn),
+                "repeat": repeat,
+            })
+            print(f"{name:20s} {_describe(params):24s} "
+                  f"{median * 1000:10.3f} ms {1 / median:10.1f} ops/s "
+                  f"{results[-1]['peak_bytes'] / 1024:10.1f} KiB", file=sys.stderr)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "seed": SEED,
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold=0.10):
+    """Return the (name, params, ratio) of cases slower than baseline by more than threshold."""
+    previous = {(r["name"], json.dumps(r["params"], sort_keys=True)): r
+                for r in baseline["results"]}
+    regressions = []
+    for r in current["results"]:
+        old = previous.get((r["name"], json.dumps(r["params"], sort_keys=True)))
+        if old is None:
+            continue
+        ratio = r["median_s"] / old["median_s"]
+        if ratio > 1 + threshold:
+            regressions.append((r["name"], r["params"], ratio))
+    return regressions
+
+
+def _describe(params):
+    return " ".join(f"{k}={v}" for k, v in params.items())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the maze performance benchmarks.")
+    parser.add_argument("--quick", action="store_true", help="fewer sizes and repeats")
+    parser.add_argument("--only", nargs="*", help="run cases whose name contains one of these")
+    parser.add_argument("--repeat", type=int, help="timed samples per case")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="baseline JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed slowdown before a case counts as a regression")
+    args = parser.parse_args(argv)
+
+    report = run(args.quick, args.only, args.repeat)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        for name, params, ratio in regressions:
+            print(f"REGRESSION {name} {_describe(params)}: x{ratio:.2f}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
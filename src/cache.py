@@ -0,0 +1,148 @@
+"""
+Content-addressed disk cache of generated levels.
+
+An entry holds the binary maze (grid, start/end, seed, algorithm) and its
+precomputed exit distance field, so a cached level is ready to play
+without running the generator, the farthest-point search or the exit BFS.
+Entries are named after a sha256 of (level, dims, seed, algorithm, format
+version). Reads refresh the file's mtime; once the cache grows past
+max_bytes the least recently used entries are deleted.
+"""
+import hashlib
+import os
+import struct
+import sys
+import threading
+import zlib
+from array import array
+
+from . import mazefile
+
+FORMAT = 1
+SUFFIX = ".lvl"
+
+# magic, format, byte order, field itemsize, maze blob length
+_HEADER = struct.Struct("<4sBBBI")
+_MAGIC = b"LVLC"
+_ORDER = b"l" if sys.byteorder == "little" else b"b"
+
+
+class LevelCache:
+    def __init__(self, directory, max_bytes=64 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self.total_bytes = sum(size for _, size, _ in self._entries())
+
+    @staticmethod
+    def key(level, rows, cols, seed, algorithm):
+        """Hex digest naming the entry of a generated level."""
+        text = f"{FORMAT}:{mazefile.VERSION}:{level}:{rows}x{cols}:{seed}:{algorithm}"
+        return hashlib.sha256(text.encode("ascii")).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + SUFFIX)
+
+    def get(self, level, rows, cols, seed, algorithm):
+        """Return the cached Maze (exit field installed), or None on a miss."""
+        path = self.path(self.key(level, rows, cols, seed, algorithm))
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            maze = self._decode(data)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (ValueError, struct.error, zlib.error):
+            # Corrupt or foreign entry: drop it and regenerate
+            self._remove(path)
+            self.misses += 1
+            return None
+        if (maze.rows, maze.cols, maze.seed) != (rows, cols, seed):
+            self._remove(path)
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return maze
+
+    def put(self, maze, level):
+        """Store a generated maze (computing its exit field if needed)."""
+        key = self.key(level, maze.rows, maze.cols, maze.seed, maze.algorithm)
+        path = self.path(key)
+        data = self._encode(maze)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        with self._lock:
+            old = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp, path)
+            self.total_bytes += len(data) - old
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits max_bytes."""
+        with self._lock:
+            self._evict()
+
+    def _evict(self):
+        entries = sorted(self._entries(), key=lambda e: e[2])
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            if self._remove(path):
+                total -= size
+        self.total_bytes = total
+
+    def clear(self):
+        with self._lock:
+            for path, _, _ in self._entries():
+                self._remove(path)
+            self.total_bytes = 0
+
+    def _entries(self):
+        """(path, size, mtime) of every cache entry."""
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(SUFFIX) and entry.is_file():
+                    st = entry.stat()
+                    yield entry.path, st.st_size, st.st_mtime
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+    @staticmethod
+    def _encode(maze):
+        blob = mazefile.dumps(maze)
+        field = maze.exit_field()
+        header = _HEADER.pack(_MAGIC, FORMAT, _ORDER[0], field.itemsize, len(blob))
+        return header + blob + zlib.compress(field.tobytes(), 1)
+
+    @staticmethod
+    def _decode(data):
+        magic, fmt, order, itemsize, blob_len = _HEADER.unpack_from(data)
+        if magic != _MAGIC or fmt != FORMAT:
+            raise ValueError("Not a level cache entry.")
+        offset = _HEADER.size
+        maze = mazefile.loads(data[offset:offset + blob_len])
+        field = array("i")
+        if field.itemsize != itemsize:
+            raise ValueError("Exit field item size mismatch.")
+        field.frombytes(zlib.decompress(data[offset + blob_len:]))
+        if order != _ORDER[0]:
+            field.byteswap()
+        maze.set_exit_field(field)
+        return maze
@@ -0,0 +1,367 @@
+"""
+Solver strategy comparison over a maze corpus.
+
+    python -m src.compare --count 300 --levels 1-15 --csv results.csv
+    python -m src.compare corpus/ --strategies dfs,bfs,corridor,tree --by-level
+
+Every maze is solved from its start to its exit by each strategy, on a
+process pool: the DFS Solver ("dfs"), Maze.shortest_path's exit field
+("field") and every engine of pathfinding.STRATEGIES. For each maze and
+strategy it records nodes expanded, moves emitted, backtracks, the peak
+frontier (queue, open list, BFS layer or DFS stack), the route length and
+the wall time.
+
+Wall time comes from a plain run. The counters come from a second run
+that swaps counting frontier containers into the finders (see
+PathFinder) and steps the Solver from outside, so the searches carry no
+instrumentation of their own; --no-counters skips that run. Caches
+(exit field, corridor graph, tree index) are cleared before each run
+unless --warm is given.
+"""
+import argparse
+import csv
+import heapq
+import json
+import os
+import statistics
+import sys
+import time
+from collections import Counter, deque
+from multiprocessing import Pool
+
+from . import graph, treeindex  # noqa: F401 -- loaded up front so no run times the import
+from .batch import build_jobs, parse_levels, parse_size
+from .generator import MazeGenerator
+from .maze import Maze
+from .pathfinding import STRATEGIES
+from .solver import Solver
+
+SUFFIXES = (".lab", ".txt")
+MANIFEST = "manifest.jsonl"
+FIELDS = ("maze", "level", "rows", "cols", "strategy", "expanded", "moves",
+          "backtracks", "peak_frontier", "length", "optimal", "ms")
+
+
+def strategy_names():
+    return ["dfs", "field"] + list(STRATEGIES)
+
+
+# === Counting frontiers ===
+class _CountingDeque(deque):
+    def __init__(self, owner, items=()):
+        super().__init__(items)
+        self.owner = owner
+        owner.peak_frontier = max(owner.peak_frontier, len(self))
+
+    def append(self, item):
+        super().append(item)
+        if len(self) > self.owner.peak_frontier:
+            self.owner.peak_frontier = len(self)
+
+
+class _CountingList(list):
+    def __init__(self, owner):
+        super().__init__()
+        self.owner = owner
+
+    def append(self, item):
+        super().append(item)
+        if len(self) > self.owner.peak_frontier:
+            self.owner.peak_frontier = len(self)
+
+
+class _Counting:
+    """PathFinder mixin recording the peak frontier size of each search."""
+
+    peak_frontier = 0
+
+    def find(self, maze, start, end):
+        self.peak_frontier = 0
+        return super().find(maze, start, end)
+
+    def queue(self, items):
+        return _CountingDeque(self, items)
+
+    def layer(self):
+        return _CountingList(self)
+
+    def heappush(self, heap, item):
+        heapq.heappush(heap, item)
+        if len(heap) > self.peak_frontier:
+            self.peak_frontier = len(heap)
+
+
+_counting_classes = {}
+
+
+def counting(finder_cls):
+    """Subclass of a PathFinder class that also records peak_frontier."""
+    cls = _counting_classes.get(finder_cls)
+    if cls is None:
+        cls = type(f"Counting{finder_cls.__name__}", (_Counting, finder_cls), {})
+        _counting_classes[finder_cls] = cls
+    return cls
+
+
+# === Strategies ===
+def _cold(maze):
+    maze._exit_field = None
+    maze._corridor_graph = None
+    maze._tree_index_key = None
+
+
+def _solve(maze, strategy):
+    """Plain run: (moves emitted, route length or -1)."""
+    if strategy == "dfs":
+        solver = Solver(maze)
+        moves = sum(1 for _ in solver.solve_generator(maze.start_pos))
+        return moves, len(solver._frames) - 1 if solver._frames else -1
+    if strategy == "field":
+        path = maze.shortest_path(maze.start_pos, maze.end_pos)
+    else:
+        path = STRATEGIES[strategy]().find(maze, maze.start_pos, maze.end_pos)
+    return max(len(path) - 1, 0), len(path) - 1 if path else -1
+
+
+def _count(maze, strategy):
+    """Counting run: (expanded, backtracks, peak frontier)."""
+    if strategy == "dfs":
+        solver = Solver(maze)
+        solver.reset(maze.start_pos)
+        frames = solver._frames
+        backtracks = 0
+        depth = peak = len(frames)
+        while solver.step() is not None:
+            n = len(frames)
+            if n < depth:
+                backtracks += 1
+            elif n > peak:
+                peak = n
+            depth = n
+        return solver._seen.count(1), backtracks, peak
+    if strategy == "field":
+        # The whole-grid BFS keeps one layer as its frontier
+        layers = Counter(maze.exit_field())
+        del layers[-1]
+        return sum(layers.values()), 0, max(layers.values(), default=0)
+    finder = counting(STRATEGIES[strategy])()
+    finder.find(maze, maze.start_pos, maze.end_pos)
+    return finder.expanded, 0, finder.peak_frontier
+
+
+def measure(maze, strategy, counters=True, repeat=1, warm=False):
+    """Solve maze with one strategy; returns a dict of the FIELDS it measures."""
+    optimal = maze.optimal_length() - 1
+    if warm:
+        _solve(maze, strategy)
+    best = None
+    for _ in range(repeat):
+        if not warm:
+            _cold(maze)
+        t0 = time.perf_counter()
+        moves, length = _solve(maze, strategy)
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    row = {"strategy": strategy, "moves": moves, "length": length,
+           "optimal": length == optimal, "ms": round(best * 1000, 4),
+           "expanded": None, "backtracks": None, "peak_frontier": None}
+    if counters:
+        if not warm:
+            _cold(maze)
+        row["expanded"], row["backtracks"], row["peak_frontier"] = _count(maze, strategy)
+    return row
+
+
+# === Corpus ===
+def load_source(source):
+    """
+    Build the maze of a job: ("gen", batch job) or ("file", (path, record))
+    where record is the file's manifest entry or None. Returns (name, level, maze).
+    """
+    kind, spec = source
+    if kind == "file":
+        path, record = spec
+        maze = Maze(path)
+        if record is None:
+            return os.path.basename(path), None, maze
+        # Text mazes do not store their generation metadata: take the manifest's
+        if maze.seed is None:
+            maze.seed = record.get("seed")
+        maze.algorithm = maze.algorithm or record.get("algorithm")
+        return os.path.basename(path), record.get("level"), maze
+    i, level, rows, cols, seed, algorithm = spec
+    grid, start_pos, end_pos = MazeGenerator.generate(rows, cols, seed=seed, algorithm=algorithm)
+    maze = Maze(grid=grid, start_pos=start_pos, end_pos=end_pos)
+    maze.seed = seed
+    maze.algorithm = algorithm
+    return i, level, maze
+
+
+def compare_one(args):
+    """
+    Worker: measure every strategy on one maze. Returns (rows, skipped):
+    skipped is (name, reason) for a maze that cannot be solved, else None.
+    """
+    source, strategies, counters, repeat, warm = args
+    try:
+        name, level, maze = load_source(source)
+    except (OSError, ValueError) as e:
+        kind, spec = source
+        return [], (os.path.basename(spec[0]) if kind == "file" else spec[0], str(e))
+    if maze.start_pos is None or maze.end_pos is None:
+        return [], (name, "no start or exit")
+    rows = []
+    for strategy in strategies:
+        row = measure(maze, strategy, counters, repeat, warm)
+        row.update(maze=name, level=level, rows=maze.rows, cols=maze.cols)
+        rows.append(row)
+    return rows, None
+
+
+def run(sources, strategies=None, workers=None, counters=True, repeat=1, warm=False):
+    """
+    Measure every source on a process pool. Returns (rows, skipped): rows in
+    corpus order and the (name, reason) of every maze that was skipped.
+    """
+    sources = list(sources)
+    strategies = strategies or strategy_names()
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(sources) // (workers * 16))
+    tasks = [(source, strategies, counters, repeat, warm) for source in sources]
+    with Pool(workers) as pool:
+        results = pool.map(compare_one, tasks, chunksize)
+    rows = [row for maze_rows, _ in results for row in maze_rows]
+    return rows, [skipped for _, skipped in results if skipped is not None]
+
+
+def _read_manifest(directory):
+    """file name -> record from the manifest.jsonl written by src.batch ({} if none)."""
+    try:
+        with open(os.path.join(directory, MANIFEST)) as f:
+            return {record["file"]: record for record in map(json.loads, filter(str.strip, f))}
+    except FileNotFoundError:
+        return {}
+
+
+def _collect(targets):
+    """("file", (path, manifest record)) sources for maze files and directories."""
+    manifests = {}
+    for target in targets:
+        if os.path.isdir(target):
+            paths = [os.path.join(target, name) for name in sorted(os.listdir(target))
+                     if name.endswith(SUFFIXES)]
+        else:
+            paths = [target]
+        for path in paths:
+            directory, name = os.path.split(path)
+            if directory not in manifests:
+                manifests[directory] = _read_manifest(directory or ".")
+            yield ("file", (path, manifests[directory].get(name)))
+
+
+# === Reports ===
+def _mean(values):
+    values = [v for v in values if v is not None]
+    return statistics.fmean(values) if values else None
+
+
+def summarize(rows, key=("strategy",)):
+    """Aggregate rows per key: one dict per group, fastest strategies first."""
+    groups = {}
+    for row in rows:
+        groups.setdefault(tuple(row[k] for k in key), []).append(row)
+    table = []
+    for group, members in groups.items():
+        entry = dict(zip(key, group))
+        entry.update(
+            mazes=len(members),
+            median_ms=statistics.median(r["ms"] for r in members),
+            mean_ms=statistics.fmean(r["ms"] for r in members),
+            expanded=_mean(r["expanded"] for r in members),
+            peak_frontier=_mean(r["peak_frontier"] for r in members),
+            moves=_mean(r["moves"] for r in members),
+            backtracks=_mean(r["backtracks"] for r in members),
+            optimal=100 * sum(r["optimal"] for r in members) / len(members),
+        )
+        table.append(entry)
+    table.sort(key=lambda e: tuple(e[k] if e[k] is not None else -1 for k in key[:-1])
+               + (e["mean_ms"],))
+    return table
+
+
+def format_table(table, key=("strategy",)):
+    def num(value, fmt):
+        return "-" if value is None else format(value, fmt)
+
+    header = " ".join(f"{k:>8s}" if k == "level" else f"{k:14s}" for k in key)
+    lines = [f"{header} {'mazes':>6s} {'med ms':>9s} {'mean ms':>9s} {'expanded':>10s} "
+             f"{'peak':>8s} {'moves':>10s} {'backtr.':>9s} {'optimal':>8s}"]
+    for e in table:
+        cols = " ".join(f"{num(e[k], 'd'):>8s}" if k == "level" else f"{e[k]:14s}" for k in key)
+        lines.append(
+            f"{cols} {e['mazes']:6d} {e['median_ms']:9.3f} {e['mean_ms']:9.3f} "
+            f"{num(e['expanded'], '10.1f'):>10s} {num(e['peak_frontier'], '8.1f'):>8s} "
+            f"{num(e['moves'], '10.1f'):>10s} {num(e['backtracks'], '9.1f'):>9s} "
+            f"{e['optimal']:7.1f}%")
+    return "\n".join(lines)
+
+
+def write_csv(rows, path):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({k: row[k] for k in FIELDS})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare solver strategies over a maze corpus.")
+    parser.add_argument("paths", nargs="*", help="maze files or directories (default: generate)")
+    parser.add_argument("--count", type=int, default=100, help="mazes to generate without paths")
+    parser.add_argument("--levels", default="1-15", help='levels to cycle through, e.g. "1-15" or "1,5,10"')
+    parser.add_argument("--size", help='fixed size "ROWSxCOLS" instead of levels')
+    parser.add_argument("--seed", type=int, default=0, help="base seed (maze i uses seed + i)")
+    parser.add_argument("--algorithm", choices=MazeGenerator.ALGORITHMS, default="backtracker")
+    parser.add_argument("--strategies", help=f"comma-separated subset of {','.join(strategy_names())}")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--repeat", type=int, default=1, help="timed runs per maze (best is kept)")
+    parser.add_argument("--warm", action="store_true", help="keep maze caches between runs")
+    parser.add_argument("--no-counters", action="store_true", help="only measure wall time")
+    parser.add_argument("--by-level", action="store_true", help="also print a table per level")
+    parser.add_argument("--csv", help="write one row per maze and strategy")
+    args = parser.parse_args(argv)
+
+    strategies = None
+    if args.strategies:
+        strategies = args.strategies.split(",")
+        unknown = [s for s in strategies if s not in strategy_names()]
+        if unknown:
+            parser.error(f"unknown strategies: {', '.join(unknown)}")
+    if args.paths:
+        sources = list(_collect(args.paths))
+    else:
+        jobs = build_jobs(args.count, parse_levels(args.levels),
+                          parse_size(args.size) if args.size else None,
+                          args.seed, args.algorithm)
+        sources = [("gen", job) for job in jobs]
+
+    t0 = time.perf_counter()
+    rows, skipped = run(sources, strategies, args.workers, not args.no_counters,
+                        args.repeat, args.warm)
+    elapsed = time.perf_counter() - t0
+    for name, reason in skipped:
+        print(f"skipped {name}: {reason}", file=sys.stderr)
+
+    print(format_table(summarize(rows)))
+    if args.by_level:
+        key = ("level", "strategy")
+        print()
+        print(format_table(summarize(rows, key), key))
+    if args.csv:
+        write_csv(rows, args.csv)
+    print(f"{len(sources) - len(skipped)} mazes x {len(strategies or strategy_names())} strategies "
+          f"in {elapsed:.2f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
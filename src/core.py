@@ -0,0 +1,240 @@
+import hashlib
+import random
+import time
+from . import perf
+from .maze import Maze
+from .generator import MazeGenerator
+from .replay import Replay
+
+
+class GameCore:
+    """
+    Game rules without any UI: level generation, moves, win detection,
+    score, hints, level progression and the level timer.
+    clock is any callable returning seconds (time.time by default), so
+    games can be simulated headless with a fake clock. With a base seed
+    every level number maps to a fixed maze; cache is an optional
+    LevelCache holding generated levels with their exit field.
+    """
+
+    HINT_STEPS = 6
+    ALGORITHM = "backtracker"
+
+    def __init__(self, maze_file=None, clock=time.time, seed=None, cache=None):
+        self.clock = clock
+        self.maze_file = maze_file
+        self.base_seed = seed
+        self.cache = cache
+        self.maze = None
+        self.current_level = 1
+        self.total_score = 0
+        self.last_score = 0
+        self.game_won = False
+        self.hints_used = 0
+        self.start_time = None
+        self.elapsed = 0
+        # Player state
+        self.row = 0
+        self.col = 0
+        self.move_count = 0
+        self.visited_cells = set()
+        # Replay of the level being played, and of the last level won
+        self.replay = None
+        self.last_replay = None
+        # Pathfinding engine for hints: None walks the cached exit field;
+        # other strategies (e.g. "jps" for open rooms) are opt-in
+        self.hint_strategy = None
+
+    # === Levels ===
+    def load_maze(self, filename=None):
+        """Load the maze from a file (raises if it cannot be read)."""
+        self.maze = Maze(filename or self.maze_file)
+
+    @staticmethod
+    def level_seed(base_seed, level):
+        """Seed of a level in the level set derived from base_seed."""
+        digest = hashlib.sha256(f"{base_seed}:{level}".encode("ascii")).digest()
+        return int.from_bytes(digest[:8], "little") >> 1
+
+    @perf.probe("generate_level")
+    def generate_level(self, level, seed=None):
+        """Generate (or read from the cache) the maze for the given level."""
+        self.maze = self.build_level(level, seed)
+
+    def build_level(self, level, seed=None):
+        """
+        Return a ready-to-play Maze for the given level, exit field included,
+        without touching the game state (safe to call from a worker thread).
+        Without a seed one is derived from the base seed, or drawn, and kept
+        on the maze so every level can be regenerated. Cached levels are
+        read instead of generated.
+        """
+        if seed is None:
+            if self.base_seed is not None:
+                seed = self.level_seed(self.base_seed, level)
+            else:
+                seed = random.getrandbits(63)
+        rows, cols = MazeGenerator.difficulty_settings(level)
+        if self.cache is not None:
+            maze = self.cache.get(level, rows, cols, seed, self.ALGORITHM)
+            if maze is not None:
+                return maze
+        grid, start_pos, end_pos = MazeGenerator.generate(rows, cols, seed=seed)
+        maze = Maze(grid=grid, start_pos=start_pos, end_pos=end_pos)
+        maze.seed = seed
+        maze.algorithm = self.ALGORITHM
+        maze.exit_field()
+        if self.cache is not None:
+            try:
+                self.cache.put(maze, level)
+            except OSError as e:
+                print(f"Level cache write failed: {e}")
+        return maze
+
+    def start_level(self):
+        """Reset the per-level state and start the timer."""
+        self.game_won = False
+        self.hints_used = 0
+        self.reset_player()
+        self.start_timer()
+        self.replay = Replay.for_maze(self.maze, self.current_level) if self.maze else None
+
+    def next_level(self):
+        """Advance to and start the next level."""
+        self.current_level += 1
+        self.generate_level(self.current_level)
+        self.start_level()
+
+    def reset_player(self):
+        """Put the player back on the start cell with no moves."""
+        self.move_count = 0
+        self.visited_cells = set()
+        if self.maze and self.maze.start_pos:
+            self.row, self.col = self.maze.start_pos
+            self.visited_cells.add(self.maze.start_pos)
+        else:
+            self.row, self.col = 0, 0
+
+    @property
+    def position(self):
+        return (self.row, self.col)
+
+    # === Moves ===
+    def move(self, dr, dc):
+        """Attempt to move by (dr, dc). Returns True if the player moved."""
+        if self.game_won:
+            return False
+        new_r = self.row + dr
+        new_c = self.col + dc
+        if self.maze.is_wall(new_r, new_c):
+            return False # Hit wall
+        self.row = new_r
+        self.col = new_c
+        self.move_count += 1
+        self.visited_cells.add((new_r, new_c))
+        if self.replay is not None:
+            times = self.replay.times
+            ms = self._elapsed_ms(self.clock() - self.start_time)
+            self.replay.record_move(dr, dc, max(ms, times[-1]) if times else ms)
+        return True
+
+    def check_win(self):
+        """
+        Finish the level if the player stands on the exit.
+        Returns True when the level was just won; the score is then in
+        last_score and already added to total_score.
+        """
+        if self.game_won or not self.maze.is_exit(self.row, self.col):
+            return False
+        self.tick()
+        # Whole milliseconds, so a replay recomputes exactly the same score
+        self.elapsed = self._elapsed_ms(self.elapsed) / 1000
+        self.game_won = True
+        self.last_score = self.calculate_score()
+        self.total_score += self.last_score
+        if self.replay is not None:
+            self.replay.elapsed_ms = self._elapsed_ms(self.elapsed)
+            self.replay.score = self.last_score
+            self.last_replay = self.replay
+        return True
+
+    def hint_engine(self):
+        """
+        The strategy hints use for the current maze: hint_strategy, with
+        "auto" resolved to the tree index for perfect mazes and to the
+        exit field (None) otherwise.
+        """
+        if self.hint_strategy == "auto":
+            return "tree" if self.maze.tree_index() is not None else None
+        return self.hint_strategy
+
+    def optimal_length(self):
+        """Cells on the optimal start-to-exit path (0 if none), via the hint engine."""
+        maze = self.maze
+        engine = self.hint_engine()
+        if maze.start_pos and maze.end_pos:
+            if engine == "corridor":
+                return maze.corridor_graph().distance(maze.start_pos, maze.end_pos) + 1
+            if engine == "tree" and maze.tree_index() is not None:
+                return maze.tree_index().distance(maze.start_pos, maze.end_pos) + 1
+        return maze.optimal_length()
+
+    def calculate_score(self):
+        """Calculate score based on moves, time, hints, and level."""
+        optimal = self.optimal_length()
+        if optimal == 0:
+            optimal = 1
+
+        # Base score from level
+        base = self.current_level * 1000
+
+        # Efficiency bonus (how close to optimal path)
+        efficiency = max(0, optimal / max(self.move_count, 1))
+        move_bonus = int(base * efficiency)
+
+        # Time bonus (faster = more points)
+        time_bonus = max(0, int(500 - self.elapsed * 2))
+
+        # Hint penalty
+        hint_penalty = self.hints_used * 200
+
+        return max(100, move_bonus + time_bonus - hint_penalty)
+
+    # === Hints ===
+    def hint(self, steps=HINT_STEPS):
+        """
+        Count one hint and return (remaining, path): the number of steps left
+        to the exit (-1 if unreachable) and the next cells of the optimal path.
+        """
+        self.hints_used += 1
+        if self.replay is not None:
+            self.replay.record_hint()
+        pos = self.position
+        maze = self.maze
+        engine = self.hint_engine()
+        if engine is None:
+            remaining = maze.distance_to_exit(pos)
+            return remaining, maze.path_to_exit(pos, limit=steps)
+        if engine == "corridor":
+            # Only the displayed steps are expanded back to cells
+            return maze.corridor_graph().route(pos, maze.end_pos, limit=steps)
+        if engine == "tree" and maze.tree_index() is not None:
+            index = maze.tree_index()
+            return index.distance(pos, maze.end_pos), index.path(pos, maze.end_pos, limit=steps)
+        path = maze.shortest_path(pos, maze.end_pos, strategy=engine)
+        return len(path) - 1, path[:steps]
+
+    # === Timer ===
+    def start_timer(self):
+        self.start_time = self.clock()
+        self.elapsed = 0
+
+    @staticmethod
+    def _elapsed_ms(seconds):
+        return max(0, round(seconds * 1000))
+
+    def tick(self):
+        """Update and return the elapsed time of the running level."""
+        if self.start_time is not None and not self.game_won:
+            self.elapsed = self.clock() - self.start_time
+        return self.elapsed
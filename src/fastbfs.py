@@ -0,0 +1,90 @@
+"""
+Whole-grid BFS distance maps.
+
+distance_map() works on the flat padded cell layout of Maze (1 = wall,
+stride = cols + 2, border cells are walls) and returns the number of steps
+from a source cell to every cell, -1 for walls and unreachable cells.
+
+Frontiers are expanded one BFS layer at a time. Narrow layers (the
+corridors of perfect mazes) are walked in plain Python; when NumPy is
+installed, wide layers (open rooms of custom mazes) are expanded as index
+arrays: gather the neighbours of the whole layer, mask out walls and seen
+cells, keep the first occurrence of each. Both paths keep the exact order
+of a queue-based BFS, so the last cell reached is the same either way.
+"""
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Layers at least this wide are expanded with NumPy
+VECTOR_MIN_FRONTIER = 128
+
+
+def offsets(stride):
+    """Neighbour offsets in queue order: up, down, left, right."""
+    return (-stride, stride, -1, 1)
+
+
+def distance_map(cells, stride, source):
+    """int32 array of BFS distances from flat index source, indexed like cells."""
+    return bfs(cells, stride, source)[0]
+
+
+def farthest(cells, stride, source):
+    """(index, distance) of the last cell a BFS from source reaches."""
+    field, last = bfs(cells, stride, source)
+    return last, field[last]
+
+
+def bfs(cells, stride, source):
+    """Distance map from source and the last cell reached (source if it is a wall)."""
+    field = array('i', [-1]) * len(cells)
+    if cells[source]:
+        return field, source
+    field[source] = 0
+    steps = offsets(stride)
+    frontier = [source]
+    last = source
+    d = 0
+    vector = np is not None and len(cells) >= VECTOR_MIN_FRONTIER * 4
+    if vector:
+        # Views share memory with cells and field: both paths update the same map
+        open_cells = np.frombuffer(cells, dtype=np.uint8) == 0
+        dist = np.frombuffer(field, dtype=np.int32)
+        np_steps = np.array(steps, dtype=np.intp)
+    while len(frontier):
+        d += 1
+        if vector and len(frontier) >= VECTOR_MIN_FRONTIER:
+            frontier = _expand_vector(frontier, d, open_cells, dist, np_steps)
+            if len(frontier):
+                last = int(frontier[-1])
+                if len(frontier) < VECTOR_MIN_FRONTIER:
+                    frontier = frontier.tolist()
+            continue
+        nxt = []
+        for i in frontier:
+            for off in steps:
+                j = i + off
+                if not cells[j] and field[j] < 0:
+                    field[j] = d
+                    nxt.append(j)
+        if nxt:
+            last = nxt[-1]
+        frontier = nxt
+    return field, last
+
+
+def _expand_vector(frontier, d, open_cells, dist, steps):
+    """Next BFS layer of frontier as an index array, in queue order."""
+    # Row-major: every cell's neighbours in turn, like the queue
+    nbrs = (np.asarray(frontier, dtype=np.intp)[:, None] + steps).ravel()
+    nbrs = nbrs[open_cells[nbrs] & (dist[nbrs] < 0)]
+    if len(nbrs) == 0:
+        return nbrs
+    _, first = np.unique(nbrs, return_index=True)
+    nbrs = nbrs[np.sort(first)]
+    dist[nbrs] = d
+    return nbrs
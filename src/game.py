@@ -1,161 +1,238 @@
-
-import tkinter as tk
+import math
+import os
 import time
-from .maze import Maze
+import tkinter as tk
+from collections import deque
+from . import perf
+from .core import GameCore
 from .ui import GameUI
 from .player import Player
-from .generator import MazeGenerator
+from .prefetch import LevelPrefetcher
+from .replay import maze_hash
+from .solver import Solver
 
 
 class Game:
-    def __init__(self, maze_file=None):
+    """
+    Tk front end over GameCore: input, drawing, labels and scheduling.
+    Arrow keys are queued and applied once per frame (at most FPS frames a
+    second): all pending moves update the state, then the turtle, fog,
+    viewport and labels are redrawn once. At most MAX_PENDING moves wait
+    in the queue, so held keys cannot build up lag.
+    """
+
+    FPS = 60
+    MAX_PENDING = 4
+    TURBO_MOVES = 25    # Auto-solve moves per frame in "Turbo"
+    CHRONO_SECONDS = 5  # Time "Chrono" takes to finish the exploration
+
+    def __init__(self, maze_file=None, seed=None, cache=None, hint_strategy=None,
+                 replay_dir=None):
         self.root = tk.Tk()
         self.maze_file = maze_file
-        self.current_level = 1
-        self.total_score = 0
-        self.game_won = False
-        self.hints_used = 0
-        self.start_time = None
+        self.replay_dir = replay_dir
+        self.core = GameCore(maze_file, seed=seed, cache=cache)
+        if hint_strategy:
+            self.core.hint_strategy = hint_strategy
+        self.prefetcher = LevelPrefetcher(self.core.build_level)
         self.timer_id = None
-        self.elapsed = 0
-        
+        self.perf_id = None
+        self.pending = deque()
+        self.frame_id = None
+        self.last_frame = 0.0
+        self.advance_id = None
+        # Replay playback: moves, their times, next index, start and speed
+        self.playback = None
+        self.playback_id = None
+
         # Initialize UI first to get the screen
         self.ui = GameUI(self.root, self)
-        
+
         # Load Maze (from file or generate level 1)
-        self.maze = None
         self.player = None
+        self.solver = None
+        self.solve_after_id = None
+        self.solve_deadline = None
+        self.solve_remaining = 0
 
         if maze_file:
             try:
-                self.maze = Maze(self.maze_file)
+                self.core.load_maze()
             except Exception as e:
                 print(f"Error loading maze: {e}")
                 self.ui.update_status(f"Erreur chargement: {e}")
-                self._generate_level(1)
+                self.core.generate_level(1)
         else:
-            self._generate_level(1)
+            self.core.generate_level(1)
 
         self._init_level()
-        
+
         # Bind Keys
         self.ui.screen.onkeypress(self.move_up, "Up")
         self.ui.screen.onkeypress(self.move_down, "Down")
         self.ui.screen.onkeypress(self.move_left, "Left")
         self.ui.screen.onkeypress(self.move_right, "Right")
         self.ui.screen.listen()
+        self._tick_perf()
+
+    # === Core state shortcuts ===
+    @property
+    def maze(self):
+        return self.core.maze
 
-    def _generate_level(self, level):
-        """Generate a random maze for the given level."""
-        rows, cols = MazeGenerator.difficulty_settings(level)
-        grid, start_pos, end_pos = MazeGenerator.generate(rows, cols)
-        self.maze = Maze(grid=grid, start_pos=start_pos, end_pos=end_pos)
+    @property
+    def current_level(self):
+        return self.core.current_level
+
+    @property
+    def game_won(self):
+        return self.core.game_won
 
     def _init_level(self):
         """Initialize/reinitialize the current level display."""
         if not self.maze:
             return
-        self.game_won = False
-        self.hints_used = 0
+        self.core.start_level()
+        self.cancel_moves()
+        self.stop_playback()
+        self.solver = None
         self.ui.calculate_cell_size(self.maze)
         self.ui.draw_maze(self.maze)
         self.setup_player()
-        self.ui.update_level_display(self.current_level)
-        self.ui.update_score(self.total_score)
+        self.ui.update_level_display(self.core.current_level)
+        self.ui.update_score(self.core.total_score)
         self.start_timer()
+        # Build the next level while this one is played
+        self.prefetcher.request(self.core.current_level + 1)
 
     def setup_player(self):
         if self.player:
-            self.player.turtle.clear()
-            self.player.turtle.hideturtle()
-            self.player.clear_trail()
-            
+            self.player.destroy()
+
         self.ui.screen.tracer(0)
         self.player = Player(self.maze, self.ui.screen, self.ui.cell_size)
         self.ui.screen.update()
         self.ui.screen.tracer(1)
         self.ui.update_moves(0)
-    
-    def move_up(self): self.handle_move(-1, 0)
-    def move_down(self): self.handle_move(1, 0)
-    def move_left(self): self.handle_move(0, -1)
-    def move_right(self): self.handle_move(0, 1)
-    
+
+    def move_up(self): self.queue_move(-1, 0)
+    def move_down(self): self.queue_move(1, 0)
+    def move_left(self): self.queue_move(0, -1)
+    def move_right(self): self.queue_move(0, 1)
+
+    # === Input and frames ===
+    def queue_move(self, dr, dc):
+        """Queue a keyboard move for the next frame (dropped if the queue is full)."""
+        if self.core.game_won or len(self.pending) >= self.MAX_PENDING:
+            return
+        self.pending.append((dr, dc))
+        if self.frame_id is None:
+            wait = self.last_frame + 1 / self.FPS - time.perf_counter()
+            self.frame_id = self.root.after(max(0, int(wait * 1000)), self._frame)
+
+    @perf.probe("frame")
+    def _frame(self):
+        self.frame_id = None
+        self.last_frame = time.perf_counter()
+        moves = list(self.pending)
+        self.pending.clear()
+        self.apply_moves(moves)
+
+    def cancel_moves(self):
+        """Drop queued input (level change, restart)."""
+        self.pending.clear()
+        if self.frame_id:
+            self.root.after_cancel(self.frame_id)
+            self.frame_id = None
+
     def handle_move(self, dr, dc):
-        if self.game_won:
+        """Apply one move right away (auto-solve)."""
+        self.apply_moves(((dr, dc),))
+
+    @perf.probe("handle_move")
+    def apply_moves(self, moves):
+        """
+        Apply moves to the game state, then redraw once: the turtle only
+        jumps to its final cell, and the fog, viewport and labels are
+        updated a single time. Moves after reaching the exit are dropped.
+        """
+        core = self.core
+        if core.game_won or not moves:
             return
-        if self.player.move(dr, dc):
-            self.ui.update_moves(self.player.move_count)
-            # Redraw maze if fog is enabled (to update visibility)
+        screen = self.ui.screen
+        screen.tracer(0)
+        moved = blocked = False
+        for dr, dc in moves:
+            if core.move(dr, dc):
+                self.player.move(dr, dc)
+                moved = True
+                blocked = False
+                if self.maze.is_exit(*core.position):
+                    break
+            else:
+                blocked = True
+        if moved:
+            self.ui.follow_player(core.position)
+            self.ui.update_moves(core.move_count)
+            # Update fog visibility around the new position
             if self.ui.fog_enabled:
-                self.redraw_current_maze()
-            self.check_win()
-        else:
+                self.ui.update_fog(core.position)
+        screen.update()
+        screen.tracer(1)
+        if blocked:
             self.ui.update_status("Mur! Impossible de passer.")
+        else:
+            self.check_win()
 
     def check_win(self):
-        if self.maze.is_exit(self.player.row, self.player.col):
-            self.game_won = True
+        core = self.core
+        if core.check_win():
             self.stop_timer()
-            score = self._calculate_score()
-            self.total_score += score
-            self.ui.update_score(self.total_score)
-            
+            self.ui.update_timer(core.elapsed)
+            self.ui.update_score(core.total_score)
+
             # Optimal path length for reference
-            optimal = len(self.maze.shortest_path(self.maze.start_pos, self.maze.end_pos))
-            
-            msg = (f"Victoire! Niveau {self.current_level} termine! "
-                   f"Score: +{score} | Mouvements: {self.player.move_count} "
-                   f"(optimal: {optimal}) | Temps: {int(self.elapsed)}s")
+            optimal = core.optimal_length()
+
+            msg = (f"Victoire! Niveau {core.current_level} termine! "
+                   f"Score: +{core.last_score} | Mouvements: {core.move_count} "
+                   f"(optimal: {optimal}) | Temps: {int(core.elapsed)}s")
             self.ui.update_status(msg)
-            
+
             # Flash victory effect
             theme = self.ui.get_theme()
             self.ui.screen.bgcolor(theme["start"])
             self.root.after(500, lambda: self.ui.screen.bgcolor(theme["bg"]))
-            
+
+            self.save_replay()
+
             # Auto-advance to next level after delay
-            self.root.after(2500, self._prompt_next_level)
+            self.advance_id = self.root.after(2500, self._prompt_next_level)
         else:
-            self.ui.update_status(f"Pos: ({self.player.row},{self.player.col}) | "
-                                  f"Mouvements: {self.player.move_count}")
+            self.ui.update_status(f"Pos: ({core.row},{core.col}) | "
+                                  f"Mouvements: {core.move_count}")
 
     def _calculate_score(self):
         """Calculate score based on moves, time, hints, and level."""
-        optimal = len(self.maze.shortest_path(self.maze.start_pos, self.maze.end_pos))
-        if optimal == 0:
-            optimal = 1
-        
-        # Base score from level
-        base = self.current_level * 1000
-        
-        # Efficiency bonus (how close to optimal path)
-        efficiency = max(0, optimal / max(self.player.move_count, 1))
-        move_bonus = int(base * efficiency)
-        
-        # Time bonus (faster = more points)
-        time_bonus = max(0, int(500 - self.elapsed * 2))
-        
-        # Hint penalty
-        hint_penalty = self.hints_used * 200
-        
-        return max(100, move_bonus + time_bonus - hint_penalty)
+        return self.core.calculate_score()
 
     def _prompt_next_level(self):
         """Advance to next level."""
-        self.current_level += 1
-        self.ui.level_var.set(self.current_level)
+        self.advance_id = None
+        self.ui.level_var.set(self.core.current_level + 1)
         self.generate_new_maze()
 
     def restart_game(self):
         """Restart current level."""
         self.stop_timer()
+        self.cancel_moves()
+        self.stop_playback()
         self.ui.clear_hints()
+        self.core.start_level()
         if self.player:
-            self.player.reset_stats()
-            self.player.teleport(*self.maze.start_pos)
-        self.game_won = False
-        self.hints_used = 0
+            self.player.clear_trail()
+            self.player.teleport(*self.core.position)
+        self.solver = None
         self.ui.update_moves(0)
         self.ui.update_status("Recommence!")
         self.redraw_current_maze()
@@ -165,86 +242,245 @@ class Game:
         """Generate a new random maze at the selected level."""
         self.stop_timer()
         level = self.ui.level_var.get()
-        self.current_level = level
-        self._generate_level(level)
+        self.core.current_level = level
+        maze = self.prefetcher.take(level)
+        if maze is not None:
+            self.core.maze = maze
+        else:
+            self.core.generate_level(level)
         self._init_level()
         self.ui.update_status(f"Nouveau labyrinthe - Niveau {level}!")
 
+    @perf.probe("redraw")
     def redraw_current_maze(self):
         """Redraw the maze (used for theme/fog changes)."""
         if not self.maze:
             return
         player_pos = None
         if self.player:
-            player_pos = (self.player.row, self.player.col)
+            player_pos = self.core.position
         self.ui.calculate_cell_size(self.maze)
         self.ui.draw_maze(self.maze, player_pos=player_pos)
         # Re-setup player on new drawing
         if self.player:
-            old_r, old_c = self.player.row, self.player.col
-            old_moves = self.player.move_count
-            old_visited = self.player.visited_cells.copy()
             old_heading = self.player.turtle.heading()
-            self.player.turtle.clear()
-            self.player.turtle.hideturtle()
-            self.player.clear_trail()
+            self.player.destroy()
             self.ui.screen.tracer(0)
             self.player = Player(self.maze, self.ui.screen, self.ui.cell_size)
-            self.player.teleport(old_r, old_c)
+            self.player.teleport(*self.core.position)
             self.player.turtle.setheading(old_heading)
-            self.player.move_count = old_moves
-            self.player.visited_cells = old_visited
             self.ui.screen.update()
             self.ui.screen.tracer(1)
 
     def show_hint(self):
         """Show the optimal path from current position to exit."""
-        if self.game_won or not self.player or not self.maze.end_pos:
+        if self.core.game_won or not self.player or not self.maze.end_pos:
             return
-        self.hints_used += 1
-        path = self.maze.shortest_path(
-            (self.player.row, self.player.col), self.maze.end_pos
-        )
-        if path:
+        remaining, hint_steps = self.core.hint()
+        if remaining >= 0:
             # Show only next few steps (not the whole path)
-            hint_steps = path[:min(6, len(path))]
             self.ui.draw_hint_path(self.maze, hint_steps, self.player.grid_to_screen)
-            self.ui.update_status(f"Indice: {len(path)-1} pas restants (indice #{self.hints_used})")
+            self.ui.update_status(f"Indice: {remaining} pas restants (indice #{self.core.hints_used})")
             # Auto-clear hint after 3 seconds
             self.root.after(3000, self.ui.clear_hints)
         else:
             self.ui.update_status("Aucun chemin trouve!")
 
     def start_auto_solve(self):
-        if self.game_won:
+        """Start auto-solve, or pause/resume it if it is already running."""
+        if self.core.game_won:
             return
-        from .solver import Solver
-        solver = Solver(self.maze)
-        self.solver_gen = solver.solve_generator((self.player.row, self.player.col))
+        pos = self.core.position
+        if self.solver and not self.solver.finished and self.solver.position == pos:
+            if self.solver.paused:
+                self.solver.resume()
+                self.solve_deadline = None
+                self.ui.update_status("Exploration automatique reprise...")
+                self.auto_solve_step()
+            else:
+                self.solver.pause()
+                if self.solve_after_id:
+                    self.root.after_cancel(self.solve_after_id)
+                    self.solve_after_id = None
+                self.ui.update_status("Exploration en pause.")
+            return
+        self.solver = Solver(self.maze)
+        self.solver.reset(pos)
+        self.solve_deadline = None
         self.ui.update_status("Exploration automatique en cours...")
         self.auto_solve_step()
 
     def auto_solve_step(self):
-        try:
-            dr, dc = next(self.solver_gen)
-            self.handle_move(dr, dc)
-            if not self.maze.is_exit(self.player.row, self.player.col):
-                speed = max(20, 150 - self.current_level * 10)
-                self.root.after(speed, self.auto_solve_step)
-        except StopIteration:
+        """Play the next batch of solver moves according to the playback mode."""
+        self.solve_after_id = None
+        solver = self.solver
+        if not solver or solver.paused:
+            return
+        mode = self.ui.solve_mode_var.get()
+        if mode == "Instantane":
+            self._solve_instant()
+            return
+        frame = max(1, 1000 // self.FPS)
+        if mode == "Turbo":
+            count, delay = self.TURBO_MOVES, frame
+        elif mode == "Chrono":
+            if self.solve_deadline is None:
+                self.solve_remaining = self._remaining_moves()
+                self.solve_deadline = time.perf_counter() + self.CHRONO_SECONDS
+            frames_left = max(1, int((self.solve_deadline - time.perf_counter()) * self.FPS))
+            count, delay = math.ceil(self.solve_remaining / frames_left), frame
+        else:
+            count, delay = 1, max(20, 150 - self.core.current_level * 10)
+        if mode != "Chrono":
+            self.solve_deadline = None
+
+        moves = []
+        while len(moves) < count:
+            move = solver.step()
+            if move is None:
+                break
+            moves.append(move)
+        if not moves:
             self.ui.update_status("Exploration terminee.")
+            return
+        self.solve_remaining -= len(moves)
+        self.apply_moves(moves)
+        if not self.maze.is_exit(*self.core.position):
+            self.solve_after_id = self.root.after(delay, self.auto_solve_step)
+
+    def _remaining_moves(self):
+        """Moves left in the exploration, counted on a snapshot of the solver."""
+        snapshot = self.solver.snapshot()
+        count = 0
+        while self.solver.step() is not None:
+            count += 1
+        self.solver.restore(snapshot)
+        return count
+
+    def _solve_instant(self):
+        """Run the rest of the exploration headless, then draw it in one pass."""
+        core = self.core
+        trail = []
+        while True:
+            move = self.solver.step()
+            if move is None:
+                break
+            trail.append(core.position)
+            core.move(*move)
+        screen = self.ui.screen
+        screen.tracer(0)
+        self.player.jump(*core.position, trail)
+        if self.solver.path and self.maze.is_exit(*core.position):
+            self.ui.draw_solution_path(self.solver.path, self.player.grid_to_screen)
+        self.ui.follow_player(core.position)
+        self.ui.update_moves(core.move_count)
+        if self.ui.fog_enabled:
+            self.ui.update_fog(core.position)
+        screen.update()
+        screen.tracer(1)
+        self.check_win()
+
+    # === Replays ===
+    def save_replay(self):
+        """Write the replay of the level just won to replay_dir, if set."""
+        replay = self.core.last_replay
+        if not self.replay_dir or replay is None:
+            return
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}_niveau{replay.level:02d}.rpl"
+        try:
+            os.makedirs(self.replay_dir, exist_ok=True)
+            replay.save(os.path.join(self.replay_dir, name))
+        except OSError as e:
+            print(f"Replay save failed: {e}")
+
+    def play_replay(self):
+        """Play back the last level won at the selected speed."""
+        replay = self.core.last_replay
+        if replay is None:
+            self.ui.update_status("Aucune partie a revoir.")
+            return
+        maze = self.maze
+        if maze_hash(maze) != replay.digest:
+            # The game moved on: show the replayed level again
+            maze = replay.build_maze()
+            if maze is None:
+                self.ui.update_status("Ce labyrinthe ne peut pas etre regenere.")
+                return
+        resume_advance = self.advance_id is not None
+        if resume_advance:
+            self.root.after_cancel(self.advance_id)
+            self.advance_id = None
+        self.stop_timer()
+        self.cancel_moves()
+        self.stop_playback()
+        if self.solve_after_id:
+            self.root.after_cancel(self.solve_after_id)
+            self.solve_after_id = None
+        self.solver = None
+        # Playback shows a finished level: input stays off until the next
+        # level or a restart, so the turtle and GameCore cannot drift apart
+        self.core.maze = maze
+        self.core.current_level = replay.level
+        self.core.game_won = True
+        self.ui.level_var.set(replay.level)
+        self.ui.update_level_display(replay.level)
+        self.ui.calculate_cell_size(self.maze)
+        self.ui.draw_maze(self.maze, player_pos=self.maze.start_pos)
+        self.setup_player()
+        self.playback = {
+            "moves": replay.directions(), "times": replay.times, "index": 0,
+            "start": time.perf_counter(), "speed": self.ui.replay_speed(),
+            "resume_advance": resume_advance,
+        }
+        self.ui.update_status(f"Replay du niveau {replay.level}...")
+        self._playback_frame()
+
+    def _playback_frame(self):
+        """Show every replay move due by now (scaled by the speed) in one render."""
+        self.playback_id = None
+        pb = self.playback
+        now_ms = (time.perf_counter() - pb["start"]) * 1000 * pb["speed"]
+        moves, times = pb["moves"], pb["times"]
+        k = pb["index"]
+        end = k
+        while end < len(moves) and times[end] <= now_ms:
+            end += 1
+        if end > k:
+            screen = self.ui.screen
+            screen.tracer(0)
+            for dr, dc in moves[k:end]:
+                self.player.move(dr, dc)
+            pos = (self.player.row, self.player.col)
+            self.ui.follow_player(pos)
+            if self.ui.fog_enabled:
+                self.ui.update_fog(pos)
+            self.ui.update_moves(end)
+            screen.update()
+            screen.tracer(1)
+            pb["index"] = end
+        if end < len(moves):
+            self.playback_id = self.root.after(max(1, 1000 // self.FPS), self._playback_frame)
+            return
+        self.playback = None
+        self.ui.update_status(f"Fin du replay ({len(moves)} mouvements).")
+        if pb["resume_advance"]:
+            self.advance_id = self.root.after(2500, self._prompt_next_level)
+
+    def stop_playback(self):
+        if self.playback_id:
+            self.root.after_cancel(self.playback_id)
+            self.playback_id = None
+        self.playback = None
 
     # === Timer ===
     def start_timer(self):
-        self.start_time = time.time()
-        self.elapsed = 0
+        self.core.start_timer()
         self.ui.update_timer(0)
         self._tick_timer()
 
     def _tick_timer(self):
-        if self.start_time and not self.game_won:
-            self.elapsed = time.time() - self.start_time
-            self.ui.update_timer(self.elapsed)
+        if self.core.start_time is not None and not self.core.game_won:
+            self.ui.update_timer(self.core.tick())
             self.timer_id = self.root.after(500, self._tick_timer)
 
     def stop_timer(self):
@@ -252,5 +488,14 @@ class Game:
             self.root.after_cancel(self.timer_id)
             self.timer_id = None
 
+    # === Performance overlay ===
+    def _tick_perf(self):
+        self.ui.update_perf()
+        self.perf_id = self.root.after(1000, self._tick_perf)
+
     def run(self):
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            self.prefetcher.shutdown()
+            perf.dump()
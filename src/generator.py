@@ -1,16 +1,28 @@
 
 import random
-from collections import deque
+
+from . import fastbfs
+
+# Grid row bytes (1=wall, 0=passage) to the text format characters
+_TEXT_TABLE = bytes.maketrans(b"\x00\x01", b".#")
 
 
 class MazeGenerator:
-    """Generates random mazes using recursive backtracking algorithm."""
+    """
+    Generates random mazes using recursive backtracking algorithm,
+    or Eller's algorithm when rows must be streamed with O(cols) memory.
+    """
+
+    ALGORITHMS = ("backtracker", "eller")
 
     @staticmethod
-    def generate(rows, cols, seed=None):
+    def generate(rows, cols, seed=None, algorithm="backtracker", rng=None):
         """
         Generate a maze grid of given size.
         rows and cols should be odd numbers for proper wall structure.
+        Randomness comes from rng, or a private random.Random(seed), never
+        from the global random module, so generation is safe to run in
+        parallel and reproducible from its seed.
         Returns a 2D grid (list of lists) with 1=wall, 0=passage,
         plus start_pos and end_pos.
         """
@@ -20,8 +32,14 @@ class MazeGenerator:
         if cols % 2 == 0:
             cols += 1
 
-        if seed is not None:
-            random.seed(seed)
+        if rng is None:
+            rng = random.Random(seed)
+
+        if algorithm == "eller":
+            grid = [list(row) for row in MazeGenerator.generate_rows(rows, cols, rng=rng)]
+            return MazeGenerator._place_endpoints(grid, rows, cols)
+        if algorithm != "backtracker":
+            raise ValueError(f"Unknown maze algorithm '{algorithm}'.")
 
         # Start with all walls
         grid = [[1 for _ in range(cols)] for _ in range(rows)]
@@ -41,14 +59,18 @@ class MazeGenerator:
                     neighbors.append((nr, nc, r + dr // 2, c + dc // 2))
 
             if neighbors:
-                nr, nc, wr, wc = random.choice(neighbors)
+                nr, nc, wr, wc = rng.choice(neighbors)
                 grid[wr][wc] = 0  # Remove wall between
                 grid[nr][nc] = 0  # Carve new cell
                 stack.append((nr, nc))
             else:
                 stack.pop()
 
-        # Place start and end as far apart as possible using BFS
+        return MazeGenerator._place_endpoints(grid, rows, cols)
+
+    @staticmethod
+    def _place_endpoints(grid, rows, cols):
+        """Place start at (1, 1) and the exit as far from it as possible."""
         start_pos = (1, 1)
         end_pos = MazeGenerator._farthest_point(grid, start_pos, rows, cols)
 
@@ -62,38 +84,109 @@ class MazeGenerator:
     @staticmethod
     def _farthest_point(grid, start, rows, cols):
         """BFS to find the farthest reachable point from start."""
-        visited = set()
-        queue = deque([start])
-        visited.add(start)
-        farthest = start
-
-        while queue:
-            r, c = queue.popleft()
-            farthest = (r, c)
-            for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                nr, nc = r + dr, c + dc
-                if 0 <= nr < rows and 0 <= nc < cols and (nr, nc) not in visited and grid[nr][nc] == 0:
-                    visited.add((nr, nc))
-                    queue.append((nr, nc))
+        stride = cols + 2
+        cells = bytearray(b"\x01") * ((rows + 2) * stride)
+        for r in range(rows):
+            base = (r + 1) * stride + 1
+            cells[base:base + cols] = bytes(grid[r])
+        i, _ = fastbfs.farthest(cells, stride, (start[0] + 1) * stride + start[1] + 1)
+        r, c = divmod(i, stride)
+        return (r - 1, c - 1)
+
+    @staticmethod
+    def generate_rows(rows, cols, seed=None, rng=None):
+        """
+        Eller's algorithm: yield the maze one grid row at a time as a
+        bytearray (1=wall, 0=passage), keeping only O(cols) state.
+        Dimensions are rounded up to odd numbers like generate(). The maze is
+        perfect, so any two passages are connected; stream() and
+        stream_to_file() use (1, 1) and (rows-2, cols-2) as start and exit.
+        """
+        rows, cols = MazeGenerator._odd(rows), MazeGenerator._odd(cols)
+        if rng is None:
+            rng = random.Random(seed)
+        h = (rows - 1) // 2
+        w = (cols - 1) // 2
+
+        # Cells of the current row in the same set form a cyclic doubly
+        # linked list (L/R); sets never cross, so c and c+1 share a set
+        # exactly when R[c] == c + 1.
+        L = list(range(w))
+        R = list(range(w))
+
+        yield bytearray(b"\x01" * cols)
+        for i in range(h):
+            line = bytearray(b"\x01" * cols)
+            line[1:cols - 1:2] = b"\x00" * w
+            below = bytearray(b"\x01" * cols)
+            last = i == h - 1
+            join_right = rng.randbytes(w)
+            go_down = rng.randbytes(w)
+            for c in range(w):
+                # Join with the right neighbour if not already in the same set
+                if c + 1 < w and c + 1 != R[c] and (last or join_right[c] & 1):
+                    R[L[c + 1]] = R[c]
+                    L[R[c]] = L[c + 1]
+                    R[c] = c + 1
+                    L[c + 1] = c
+                    line[2 * c + 2] = 0
+                if last:
+                    continue
+                # Keep a wall below only if another cell carries the set down
+                if c != R[c] and go_down[c] & 1:
+                    L[R[c]] = L[c]
+                    R[L[c]] = R[c]
+                    L[c] = R[c] = c
+                else:
+                    below[2 * c + 1] = 0
+            yield line
+            yield below if not last else bytearray(b"\x01" * cols)
 
-        return farthest
+    @staticmethod
+    def stream(rows, cols, consumer, seed=None):
+        """
+        Generate an Eller maze and hand each row to consumer(r, row) as soon
+        as it is built. Returns (start_pos, end_pos).
+        """
+        rows, cols = MazeGenerator._odd(rows), MazeGenerator._odd(cols)
+        for r, row in enumerate(MazeGenerator.generate_rows(rows, cols, seed)):
+            consumer(r, row)
+        return (1, 1), (rows - 2, cols - 2)
+
+    @staticmethod
+    def stream_to_file(path, rows, cols, seed=None):
+        """
+        Write an Eller maze straight to a text maze file, row by row, without
+        holding the grid in memory. Returns (start_pos, end_pos).
+        """
+        rows, cols = MazeGenerator._odd(rows), MazeGenerator._odd(cols)
+        end_r, end_c = rows - 2, cols - 2
+        with open(path, "wb") as f:
+            for r, row in enumerate(MazeGenerator.generate_rows(rows, cols, seed)):
+                line = row.translate(_TEXT_TABLE)
+                if r == 1:
+                    line[1] = ord("x")
+                if r == end_r:
+                    line[end_c] = ord("X")
+                f.write(line)
+                f.write(b"\n")
+        return (1, 1), (end_r, end_c)
+
+    @staticmethod
+    def _odd(n):
+        return n if n % 2 else n + 1
 
     @staticmethod
     def to_text(grid, start_pos, end_pos):
         """Convert a grid to the text format used by the game."""
         lines = []
         for r, row in enumerate(grid):
-            line = ""
-            for c, cell in enumerate(row):
-                if (r, c) == start_pos:
-                    line += "x"
-                elif (r, c) == end_pos:
-                    line += "X"
-                elif cell == 1:
-                    line += "#"
-                else:
-                    line += "."
-            lines.append(line)
+            line = bytearray(row).translate(_TEXT_TABLE)
+            if end_pos and end_pos[0] == r:
+                line[end_pos[1]] = ord("X")
+            if start_pos and start_pos[0] == r:
+                line[start_pos[1]] = ord("x")
+            lines.append(line.decode("ascii"))
         return "\n".join(lines)
 
     @staticmethod
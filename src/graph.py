@@ -0,0 +1,246 @@
+"""
+Corridor graph: a maze compressed to its junctions.
+
+Nodes are the open cells that do not have exactly two open neighbours
+(junctions and dead ends) plus the start and exit cells. Every corridor
+between two nodes becomes one edge weighted by its length in steps, and
+each corridor cell records its edge and position along it. Searches run
+A* over the nodes only; a path is turned back into cells lazily, up to an
+optional limit, when it is displayed.
+"""
+import heapq
+from array import array
+
+_END = -1  # Virtual goal node of a search
+
+
+class CorridorGraph:
+    """Weighted junction graph of a Maze (indices are the maze's flat cell indices)."""
+
+    def __init__(self, maze):
+        self.maze = maze
+        self.stride = maze.stride
+        cells = maze.cells
+        offsets = maze.neighbor_offsets
+        size = len(cells)
+        # Edge of every corridor cell (-1 elsewhere) and its position on the edge
+        self.edge_of = array('i', [-1]) * size
+        self.edge_pos = array('i', [0]) * size
+        # Edge e joins edges[e] = (a, b, weight); its interior cells, from a to b
+        self.edges = []
+        self.edge_cells = []
+        # node -> [(neighbour node, weight, edge)]
+        self.adj = {}
+        self.expanded = 0
+
+        stride = self.stride
+        for r in range(maze.rows):
+            base = (r + 1) * stride + 1
+            for i in range(base, base + maze.cols):
+                if not cells[i] and (cells[i - 1] + cells[i + 1]
+                                     + cells[i - stride] + cells[i + stride]) != 2:
+                    self.adj[i] = []
+        for pos in (maze.start_pos, maze.end_pos):
+            if pos is not None and not maze.is_wall(*pos):
+                self.adj.setdefault(maze.index(*pos), [])
+
+        nodes = self.adj
+        edge_of = self.edge_of
+        edge_pos = self.edge_pos
+        for a in list(nodes):
+            for off in offsets:
+                cur = a + off
+                if cells[cur]:
+                    continue
+                if cur in nodes:
+                    # Adjacent nodes: a corridor without interior, added once
+                    if a < cur:
+                        self._add_edge(a, cur, 1, array('i'))
+                    continue
+                if edge_of[cur] != -1:
+                    continue  # Already walked from the other end
+                e = len(self.edges)
+                interior = array('i')
+                prev = a
+                while cur not in nodes:
+                    interior.append(cur)
+                    edge_of[cur] = e
+                    edge_pos[cur] = len(interior)
+                    for o in offsets:
+                        nxt = cur + o
+                        if nxt != prev and not cells[nxt]:
+                            break
+                    prev, cur = cur, nxt
+                self._add_edge(a, cur, len(interior) + 1, interior)
+
+    def _add_edge(self, a, b, weight, interior):
+        e = len(self.edges)
+        self.edges.append((a, b, weight))
+        self.edge_cells.append(interior)
+        if a != b:  # A corridor looping back to its node never shortens a path
+            self.adj[a].append((b, weight, e))
+            self.adj[b].append((a, weight, e))
+
+    @property
+    def node_count(self):
+        return len(self.adj)
+
+    # === Queries ===
+    def route(self, start, end, limit=None):
+        """
+        Shortest route between two (r,c) cells: (distance, path) with at most
+        limit cells of the path, or (-1, []) if end cannot be reached.
+        """
+        maze = self.maze
+        if maze.is_wall(*start) or maze.is_wall(*end):
+            return -1, []
+        found = self.search(maze.index(*start), maze.index(*end))
+        if found is None:
+            return self._fallback(start, end, limit)
+        dist, segments = found
+        return dist, [maze.position(i) for i in self.expand(segments, limit)]
+
+    def distance(self, start, end):
+        """Number of steps between two (r,c) cells, -1 if unreachable."""
+        maze = self.maze
+        if maze.is_wall(*start) or maze.is_wall(*end):
+            return -1
+        found = self.search(maze.index(*start), maze.index(*end))
+        if found is None:
+            return self._fallback(start, end)[0]
+        return found[0]
+
+    def path(self, start, end, limit=None):
+        """Shortest path as a list of (r,c), [] if unreachable."""
+        return self.route(start, end, limit)[1]
+
+    def path_indices(self, start_i, end_i, limit=None, push=heapq.heappush, pop=heapq.heappop):
+        """Shortest path as flat indices ([] if unreachable), None if the graph cannot answer."""
+        found = self.search(start_i, end_i, push, pop)
+        if found is None:
+            return None
+        return list(self.expand(found[1], limit))
+
+    def _fallback(self, start, end, limit=None):
+        """Plain BFS for endpoints the graph does not cover."""
+        path = self.maze.shortest_path(start, end, strategy="bfs")
+        return len(path) - 1, path[:limit] if limit is not None else path
+
+    def search(self, start_i, end_i, push=heapq.heappush, pop=heapq.heappop):
+        """
+        A* from start_i to end_i over the nodes. Returns (distance, segments)
+        where segments are (edge, from position, to position) walks, (-1, [])
+        if end_i is unreachable, or None if an endpoint lies on a loop
+        without any node (the graph cannot answer). push and pop replace
+        the heapq functions (see compare.py).
+        """
+        self.expanded = 0
+        if start_i == end_i:
+            return 0, [(-1, start_i, start_i)]
+        sources = self._anchors(start_i)
+        targets = self._anchors(end_i)
+        if sources is None or targets is None:
+            return None
+        stride = self.stride
+        er, ec = divmod(end_i, stride)
+
+        def h(i):
+            r, c = divmod(i, stride)
+            return abs(r - er) + abs(c - ec)
+
+        # Cost and walk from each node next to end_i onto end_i
+        exits = {}
+        for node, cost, (e, p, q) in targets:
+            # Both ends of a corridor looping back to one node: keep the nearer
+            if node not in exits or cost < exits[node][0]:
+                exits[node] = (cost, (e, q, p))
+        g = {}
+        parent = {}
+        heap = []
+        for node, cost, seg in sources:
+            if cost < g.get(node, cost + 1):
+                g[node] = cost
+                parent[node] = (None, seg)
+                push(heap, (cost + h(node), cost, node))
+        # Start and end on the same corridor
+        e_s, e_t = self.edge_of[start_i], self.edge_of[end_i]
+        if e_s != -1 and e_s == e_t:
+            p, q = self.edge_pos[start_i], self.edge_pos[end_i]
+            g[_END] = abs(p - q)
+            parent[_END] = (None, (e_s, p, q))
+            push(heap, (g[_END], g[_END], _END))
+
+        edges = self.edges
+        adj = self.adj
+        closed = set()
+        while heap:
+            _, cost, u = pop(heap)
+            if u in closed or cost > g.get(u, cost):
+                continue
+            if u == _END:
+                return cost, self._unwind(parent)
+            closed.add(u)
+            self.expanded += 1
+            if u in exits:
+                extra, seg = exits[u]
+                if cost + extra < g.get(_END, cost + extra + 1):
+                    g[_END] = cost + extra
+                    parent[_END] = (u, seg)
+                    push(heap, (cost + extra, cost + extra, _END))
+            for v, weight, e in adj[u]:
+                nc = cost + weight
+                if v not in closed and nc < g.get(v, nc + 1):
+                    g[v] = nc
+                    a, b, w = edges[e]
+                    parent[v] = (u, (e, 0, w) if u == a else (e, w, 0))
+                    push(heap, (nc + h(v), nc, v))
+        return -1, []
+
+    def _anchors(self, i):
+        """(node, cost, segment from i to the node) for the nodes nearest to cell i."""
+        if i in self.adj:
+            return [(i, 0, (-1, i, i))]
+        e = self.edge_of[i]
+        if e == -1:
+            return None
+        a, b, w = self.edges[e]
+        k = self.edge_pos[i]
+        return [(a, k, (e, k, 0)), (b, w - k, (e, k, w))]
+
+    @staticmethod
+    def _unwind(parent):
+        segments = []
+        node = _END
+        while node is not None:
+            node, seg = parent[node]
+            segments.append(seg)
+        segments.reverse()
+        return segments
+
+    def _cell(self, e, p):
+        """Cell at position p (0 = first node, weight = second node) of edge e."""
+        a, b, w = self.edges[e]
+        if p == 0:
+            return a
+        if p == w:
+            return b
+        return self.edge_cells[e][p - 1]
+
+    def expand(self, segments, limit=None):
+        """Yield the cells of a route's segments, at most limit of them."""
+        count = 0
+        last = None
+        for e, p, q in segments:
+            if e == -1:
+                walk = (p,)
+            else:
+                step = 1 if q >= p else -1
+                walk = (self._cell(e, k) for k in range(p, q + step, step))
+            for i in walk:
+                if i == last:
+                    continue
+                if limit is not None and count >= limit:
+                    return
+                yield i
+                count += 1
+                last = i
@@ -1,13 +1,102 @@
+import mmap
+import os
+from array import array
 
-from collections import deque
+from . import fastbfs, perf
+from .pathfinding import BFSFinder, get_finder
+
+WALL = 1
+PASSAGE = 0
+
+# Text format byte to cell value: '.', 'x' (start) and 'X' (exit) are
+# passages, '#' and any unknown character are walls
+_CELL_TABLE = bytes(PASSAGE if ch in b".xX" else WALL for ch in range(256))
+_WHITESPACE = b" \t\r\v\f"
+
+
+class _RowView:
+    """Compatibility view of one maze row, so that grid[r][c] keeps working."""
+
+    __slots__ = ("_maze", "_r")
+
+    def __init__(self, maze, r):
+        self._maze = maze
+        self._r = r
+
+    def __getitem__(self, c):
+        return self._maze.row(self._r)[c]
+
+    def __setitem__(self, c, value):
+        if c < 0:
+            c += self._maze.cols
+        self._maze.set_cell(self._r, c, value)
+
+    def __len__(self):
+        return self._maze.cols
+
+    def __iter__(self):
+        return iter(self._maze.row(self._r))
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def tolist(self):
+        return self._maze.row(self._r).tolist()
+
+
+class _GridView:
+    """Compatibility view exposing the flat cell buffer as a list of rows."""
+
+    __slots__ = ("_maze",)
+
+    def __init__(self, maze):
+        self._maze = maze
+
+    def __getitem__(self, r):
+        rows = self._maze.rows
+        if r < 0:
+            r += rows
+        if not 0 <= r < rows:
+            raise IndexError("maze row index out of range")
+        return _RowView(self._maze, r)
+
+    def __len__(self):
+        return self._maze.rows
+
+    def __iter__(self):
+        for r in range(self._maze.rows):
+            yield _RowView(self._maze, r)
+
+    def __eq__(self, other):
+        return self.tolist() == [list(row) for row in other]
+
+    def tolist(self):
+        return [self._maze.row(r).tolist() for r in range(self._maze.rows)]
 
 
 class Maze:
+    """
+    Maze model backed by a flat bytearray (1=wall, 0=passage).
+    The buffer is padded with a one-cell wall border, so cell (r, c) lives at
+    index (r + 1) * stride + (c + 1) and every in-maze cell has four valid
+    neighbour indices: no bounds test is needed when walking the grid.
+    """
+
     def __init__(self, filename=None, grid=None, start_pos=None, end_pos=None):
         self.filename = filename
-        self.grid = []
         self.start_pos = None
         self.end_pos = None
+        # Generation metadata, kept by the binary format
+        self.seed = None
+        self.algorithm = None
+        self.version = 0
+        self._exit_field = None
+        self._exit_field_key = None
+        self._corridor_graph = None
+        self._corridor_graph_key = None
+        self._tree_index = None
+        self._tree_index_key = None
+        self._reset_cells(0, 0)
 
         if grid is not None:
             self.grid = grid
@@ -17,43 +106,154 @@ class Maze:
             self.load_maze()
 
     def load_maze(self):
-        """Loads the maze from a file."""
+        """
+        Loads the maze from a text or binary (see mazefile) file. The file is
+        memory-mapped and each row is converted in bulk, so loading does no
+        per-character Python work.
+        """
+        from . import mazefile
         try:
-            with open(self.filename, 'r') as f:
-                lines = f.readlines()
+            f = open(self.filename, 'rb')
         except FileNotFoundError:
             raise FileNotFoundError(f"Maze file '{self.filename}' not found.")
 
-        for r, line in enumerate(lines):
-            row = []
-            for c, char in enumerate(line.strip()):
-                if char == '#':
-                    row.append(1) # Wall
-                elif char == '.':
-                    row.append(0) # Passage
-                elif char == 'x':
-                    row.append(0)
-                    self.start_pos = (r, c)
-                elif char == 'X':
-                    row.append(0)
-                    self.end_pos = (r, c)
+        with f:
+            if os.fstat(f.fileno()).st_size == 0:
+                self._reset_cells(0, 0)
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                if mazefile.is_binary(data):
+                    mazefile.unpack_into(self, data)
                 else:
-                    row.append(1) # Treat unknown as wall default
-            self.grid.append(row)
+                    self._parse_text(data)
+
+    def _parse_text(self, data):
+        """Fill the cell buffer from text maze bytes ('#' wall, '.' passage, 'x' start, 'X' exit)."""
+        # Row spans, with surrounding whitespace stripped like str.strip()
+        spans = []
+        size = len(data)
+        pos = 0
+        while pos < size:
+            nl = data.find(b"\n", pos)
+            if nl == -1:
+                nl = size
+            start, end = pos, nl
+            while start < end and data[start] in _WHITESPACE:
+                start += 1
+            while end > start and data[end - 1] in _WHITESPACE:
+                end -= 1
+            spans.append((start, end))
+            pos = nl + 1
+        # Trailing blank lines are not rows
+        while spans and spans[-1][0] == spans[-1][1]:
+            spans.pop()
+
+        cols = spans[0][1] - spans[0][0] if spans else 0
+        for r, (start, end) in enumerate(spans):
+            if end - start != cols:
+                raise ValueError(
+                    f"Maze file '{self.filename}' has ragged rows: line {r + 1} "
+                    f"has {end - start} cells, expected {cols}.")
+
+        self._reset_cells(len(spans), cols)
+        cells = self.cells
+        stride = self._stride
+        for r, (start, end) in enumerate(spans):
+            line = data[start:end]
+            c = line.rfind(b"x")
+            if c >= 0:
+                self.start_pos = (r, c)
+            c = line.rfind(b"X")
+            if c >= 0:
+                self.end_pos = (r, c)
+            base = (r + 1) * stride + 1
+            cells[base:base + cols] = line.translate(_CELL_TABLE)
+
+    def save(self, path, compress=False):
+        """Save the maze in the compact binary format (see mazefile)."""
+        from . import mazefile
+        mazefile.save(self, path, compress)
+
+    @classmethod
+    def load(cls, path):
+        """Load a maze saved with save()."""
+        from . import mazefile
+        return mazefile.load(path)
+
+    # === Storage ===
+    def _reset_cells(self, rows, cols):
+        """Allocate an all-wall buffer for a rows x cols maze."""
+        self._rows = rows
+        self._cols = cols
+        self._stride = cols + 2
+        self.cells = bytearray(b"\x01") * ((rows + 2) * (cols + 2))
+        # Neighbour offsets in the flat buffer: up, down, left, right
+        self.neighbor_offsets = (-self._stride, self._stride, -1, 1)
+        self._changed()
+
+    def _changed(self):
+        self.version += 1
+
+    @property
+    def grid(self):
+        """List-of-rows view of the maze (grid[r][c] is 1 for walls)."""
+        return _GridView(self)
+
+    @grid.setter
+    def grid(self, rows):
+        rows = list(rows)
+        cols = max((len(row) for row in rows), default=0)
+        self._reset_cells(len(rows), cols)
+        stride = self._stride
+        cells = self.cells
+        for r, row in enumerate(rows):
+            base = (r + 1) * stride + 1
+            cells[base:base + len(row)] = bytes(1 if v else 0 for v in row)
 
     @property
     def rows(self):
-        return len(self.grid)
+        return self._rows
 
     @property
     def cols(self):
-        return len(self.grid[0]) if self.grid else 0
+        return self._cols
+
+    @property
+    def stride(self):
+        """Length of one padded row in the flat cell buffer."""
+        return self._stride
+
+    def index(self, r, c):
+        """Flat buffer index of cell (r, c)."""
+        return (r + 1) * self._stride + c + 1
+
+    def position(self, i):
+        """Grid coordinates (r, c) of flat buffer index i."""
+        r, c = divmod(i, self._stride)
+        return (r - 1, c - 1)
+
+    def row(self, r):
+        """Read-only memoryview over the cells of row r (no copy)."""
+        base = (r + 1) * self._stride + 1
+        return memoryview(self.cells)[base:base + self._cols].toreadonly()
+
+    def row_bytes(self, r):
+        """Copy of row r as bytes (1=wall, 0=passage)."""
+        base = (r + 1) * self._stride + 1
+        return bytes(self.cells[base:base + self._cols])
+
+    def set_cell(self, r, c, value):
+        """Set cell (r, c) to WALL or PASSAGE."""
+        if not (0 <= r < self._rows and 0 <= c < self._cols):
+            raise IndexError(f"Cell ({r}, {c}) is outside the maze.")
+        self.cells[(r + 1) * self._stride + c + 1] = 1 if value else 0
+        self._changed()
 
     def is_wall(self, r, c):
         """Returns True if the cell (r, c) is a wall or out of bounds."""
-        if not (0 <= r < self.rows and 0 <= c < self.cols):
-            return True
-        return self.grid[r][c] == 1
+        if 0 <= r < self._rows and 0 <= c < self._cols:
+            return self.cells[(r + 1) * self._stride + c + 1] != 0
+        return True
 
     def is_passage(self, r, c):
         return not self.is_wall(r, c)
@@ -61,20 +261,101 @@ class Maze:
     def is_exit(self, r, c):
         return (r, c) == self.end_pos
 
-    def shortest_path(self, start, end):
-        """BFS to find shortest path from start to end. Returns list of (r,c) positions."""
+    # === Exit distance field ===
+    def exit_field(self):
+        """
+        BFS distance (in steps) from every cell to end_pos, indexed like
+        self.cells, with -1 for walls and unreachable cells. Computed once and
+        cached until the grid or end_pos changes.
+        """
+        key = (self.version, self.end_pos)
+        if self._exit_field is None or self._exit_field_key != key:
+            self._exit_field = self._compute_exit_field()
+            self._exit_field_key = key
+        return self._exit_field
+
+    def set_exit_field(self, field):
+        """Install a precomputed exit field (e.g. loaded from a cache)."""
+        if len(field) != len(self.cells):
+            raise ValueError("Exit field does not match the maze size.")
+        self._exit_field = field
+        self._exit_field_key = (self.version, self.end_pos)
+
+    def _compute_exit_field(self):
+        if self.end_pos is None or self.is_wall(*self.end_pos):
+            return array('i', [-1]) * len(self.cells)
+        return fastbfs.distance_map(self.cells, self.stride, self.index(*self.end_pos))
+
+    def corridor_graph(self):
+        """
+        CorridorGraph of the maze (see graph.py), built once and cached until
+        the grid, start_pos or end_pos changes.
+        """
+        from .graph import CorridorGraph
+        key = (self.version, self.start_pos, self.end_pos)
+        if self._corridor_graph is None or self._corridor_graph_key != key:
+            self._corridor_graph = CorridorGraph(self)
+            self._corridor_graph_key = key
+        return self._corridor_graph
+
+    def tree_index(self):
+        """
+        TreeIndex of the maze (see treeindex.py), or None when the open cells
+        do not form a single tree. Cached until the grid or end_pos changes.
+        """
+        from .treeindex import TreeIndex
+        key = (self.version, self.end_pos)
+        if self._tree_index_key != key:
+            self._tree_index = TreeIndex.build(self)
+            self._tree_index_key = key
+        return self._tree_index
+
+    def distance_to_exit(self, pos):
+        """Number of steps from pos to end_pos, or -1 if unreachable."""
+        r, c = pos
+        if not (0 <= r < self._rows and 0 <= c < self._cols):
+            return -1
+        return self.exit_field()[self.index(r, c)]
+
+    def path_to_exit(self, start, limit=None):
+        """
+        Shortest path from start to end_pos as a list of (r,c), walked down the
+        exit field in O(path length). limit caps the number of cells returned.
+        """
+        d = self.distance_to_exit(start)
+        if d < 0:
+            return []
+        field = self.exit_field()
+        offsets = self.neighbor_offsets
+        i = self.index(*start)
+        path = [start]
+        while d > 0 and (limit is None or len(path) < limit):
+            d -= 1
+            for off in offsets:
+                if field[i + off] == d:
+                    i += off
+                    break
+            path.append(self.position(i))
+        return path
+
+    def optimal_length(self):
+        """Length (in cells, start and exit included) of the optimal path, 0 if none."""
+        if self.start_pos is None:
+            return 0
+        return self.distance_to_exit(self.start_pos) + 1
+
+    @perf.probe("shortest_path")
+    def shortest_path(self, start, end, strategy=None):
+        """
+        Shortest path from start to end as a list of (r,c) positions.
+        Paths to end_pos come from the cached exit field; other targets use a
+        BFS. strategy selects a pathfinding engine instead ("bfs", "astar",
+        "bidirectional", "jps", "corridor", "tree" or a PathFinder instance).
+        """
+        if strategy is not None:
+            return get_finder(strategy).find(self, start, end)
         if start == end:
             return [start]
-        visited = {start}
-        queue = deque([(start, [start])])
-        while queue:
-            (r, c), path = queue.popleft()
-            for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                nr, nc = r + dr, c + dc
-                if not self.is_wall(nr, nc) and (nr, nc) not in visited:
-                    new_path = path + [(nr, nc)]
-                    if (nr, nc) == end:
-                        return new_path
-                    visited.add((nr, nc))
-                    queue.append(((nr, nc), new_path))
-        return []  # No path found
+        if end == self.end_pos:
+            return self.path_to_exit(start)
+        return BFSFinder().find(self, start, end)
@@ -0,0 +1,124 @@
+"""
+Compact binary maze format.
+
+Layout (little-endian):
+    header   magic "LABY", version, flags, rows, cols, start (r, c),
+             end (r, c), seed, algorithm name length
+    name     algorithm name (ASCII)
+    bitmap   one row after another, 1 bit per cell (1=wall), MSB first,
+             each row padded to a whole byte; zlib-compressed if flagged
+
+Positions of -1 mean "not set". Uncompressed files are read straight
+from an mmap through memoryview slices, without copying the bitmap.
+"""
+import mmap
+import struct
+import zlib
+
+from .maze import Maze
+
+MAGIC = b"LABY"
+VERSION = 1
+
+FLAG_COMPRESSED = 0x01
+FLAG_HAS_SEED = 0x02
+
+_HEADER = struct.Struct("<4sBBIIiiiiqB")
+
+# Cell values to binary digits and back
+_TO_BITS = bytes.maketrans(b"\x00\x01", b"01")
+_FROM_BITS = bytes.maketrans(b"01", b"\x00\x01")
+
+
+def is_binary(data):
+    """True if data (bytes, mmap...) starts with the binary maze magic."""
+    return data[:len(MAGIC)] == MAGIC
+
+
+def dumps(maze, compress=False):
+    """Serialize a Maze to bytes."""
+    flags = 0
+    if compress:
+        flags |= FLAG_COMPRESSED
+    seed = maze.seed
+    if seed is not None:
+        flags |= FLAG_HAS_SEED
+    algorithm = (maze.algorithm or "").encode("ascii")
+    start = maze.start_pos or (-1, -1)
+    end = maze.end_pos or (-1, -1)
+    header = _HEADER.pack(MAGIC, VERSION, flags, maze.rows, maze.cols,
+                          start[0], start[1], end[0], end[1],
+                          seed if seed is not None else 0, len(algorithm))
+
+    row_bytes = (maze.cols + 7) // 8
+    pad = b"0" * (row_bytes * 8 - maze.cols)
+    bitmap = bytearray()
+    for r in range(maze.rows):
+        bits = maze.row_bytes(r).translate(_TO_BITS) + pad
+        bitmap += int(bits, 2).to_bytes(row_bytes, "big") if row_bytes else b""
+    if compress:
+        bitmap = zlib.compress(bitmap)
+    return header + algorithm + bitmap
+
+
+def loads(data):
+    """Build a Maze from bytes produced by dumps()."""
+    maze = Maze()
+    unpack_into(maze, data)
+    return maze
+
+
+def unpack_into(maze, data):
+    """Fill an existing Maze from binary maze data (bytes, mmap or memoryview)."""
+    with memoryview(data) as view:
+        if len(view) < _HEADER.size:
+            raise ValueError("Binary maze data is truncated.")
+        (magic, version, flags, rows, cols, sr, sc, er, ec,
+         seed, name_len) = _HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError("Not a binary maze file.")
+        if version != VERSION:
+            raise ValueError(f"Unsupported binary maze version {version}.")
+        offset = _HEADER.size
+        algorithm = bytes(view[offset:offset + name_len]).decode("ascii")
+        offset += name_len
+
+        row_bytes = (cols + 7) // 8
+        # Slices of data must be released before the caller closes its mmap,
+        # including when the bitmap turns out to be invalid
+        with view[offset:] as raw:
+            bitmap = memoryview(zlib.decompress(raw)) if flags & FLAG_COMPRESSED else raw
+            with bitmap:
+                if len(bitmap) != rows * row_bytes:
+                    raise ValueError("Binary maze bitmap does not match its dimensions.")
+
+                maze._reset_cells(rows, cols)
+                cells = maze.cells
+                stride = maze.stride
+                width = row_bytes * 8
+                for r in range(rows):
+                    value = int.from_bytes(bitmap[r * row_bytes:(r + 1) * row_bytes], "big")
+                    bits = format(value, f"0{width}b").encode("ascii")
+                    base = (r + 1) * stride + 1
+                    cells[base:base + cols] = bits[:cols].translate(_FROM_BITS)
+
+    maze.start_pos = (sr, sc) if sr >= 0 else None
+    maze.end_pos = (er, ec) if er >= 0 else None
+    maze.seed = seed if flags & FLAG_HAS_SEED else None
+    maze.algorithm = algorithm or None
+    return maze
+
+
+def save(maze, path, compress=False):
+    with open(path, "wb") as f:
+        f.write(dumps(maze, compress))
+
+
+def load(path):
+    """Load a binary maze file through mmap."""
+    maze = Maze()
+    maze.filename = path
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            unpack_into(maze, data)
+    return maze
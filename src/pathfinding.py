@@ -0,0 +1,296 @@
+import heapq
+from collections import deque
+
+
+class PathFinder:
+    """
+    Base class for shortest-path strategies.
+    find() returns a list of (r,c) positions from start to end ([] if none),
+    and `expanded` holds the number of nodes expanded by the last search.
+    Searches run on the maze's padded flat cell buffer (see Maze).
+    Frontier containers and heap operations are looked up once per search
+    from the class, so compare.py can swap in counting versions.
+    """
+
+    name = None
+    queue = deque
+    layer = list
+    heappush = staticmethod(heapq.heappush)
+    heappop = staticmethod(heapq.heappop)
+
+    def __init__(self):
+        self.expanded = 0
+
+    def find(self, maze, start, end):
+        self.expanded = 0
+        if start == end:
+            return [start]
+        if maze.is_wall(*start) or maze.is_wall(*end):
+            return []
+        path = self._search(maze, maze.index(*start), maze.index(*end))
+        return [maze.position(i) for i in path]
+
+    def _search(self, maze, start_i, end_i):
+        """Return the path as a list of flat indices, [] if unreachable."""
+        raise NotImplementedError
+
+    @staticmethod
+    def _unwind(parent, i):
+        """Rebuild the index path ending at i from a parent map (root maps to -1)."""
+        path = []
+        while i != -1:
+            path.append(i)
+            i = parent[i]
+        path.reverse()
+        return path
+
+
+class BFSFinder(PathFinder):
+    """Plain breadth-first search."""
+
+    name = "bfs"
+
+    def _search(self, maze, start_i, end_i):
+        cells = maze.cells
+        offsets = maze.neighbor_offsets
+        parent = {start_i: -1}
+        queue = self.queue([start_i])
+        while queue:
+            i = queue.popleft()
+            self.expanded += 1
+            for off in offsets:
+                j = i + off
+                if not cells[j] and j not in parent:
+                    parent[j] = i
+                    if j == end_i:
+                        return self._unwind(parent, j)
+                    queue.append(j)
+        return []
+
+
+class AStarFinder(PathFinder):
+    """A* with the Manhattan distance heuristic."""
+
+    name = "astar"
+
+    def _search(self, maze, start_i, end_i):
+        cells = maze.cells
+        offsets = maze.neighbor_offsets
+        stride = maze.stride
+        er, ec = divmod(end_i, stride)
+
+        def h(i):
+            r, c = divmod(i, stride)
+            return abs(r - er) + abs(c - ec)
+
+        push, pop = self.heappush, self.heappop
+        g = {start_i: 0}
+        parent = {start_i: -1}
+        closed = set()
+        # Ties on f are broken towards the deepest node (-g)
+        heap = [(h(start_i), 0, start_i)]
+        while heap:
+            _, neg_g, i = pop(heap)
+            if i in closed:
+                continue
+            if i == end_i:
+                return self._unwind(parent, i)
+            closed.add(i)
+            self.expanded += 1
+            ng = 1 - neg_g
+            for off in offsets:
+                j = i + off
+                if not cells[j] and j not in closed and ng < g.get(j, ng + 1):
+                    g[j] = ng
+                    parent[j] = i
+                    push(heap, (ng + h(j), -ng, j))
+        return []
+
+
+class BidirectionalBFSFinder(PathFinder):
+    """Breadth-first search run from both ends, one whole layer at a time."""
+
+    name = "bidirectional"
+
+    def _search(self, maze, start_i, end_i):
+        cells = maze.cells
+        offsets = maze.neighbor_offsets
+        parents = ({start_i: -1}, {end_i: -1})
+        dists = ({start_i: 0}, {end_i: 0})
+        frontiers = ([start_i], [end_i])
+
+        while frontiers[0] and frontiers[1]:
+            # Grow the smaller frontier
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            parent, dist = parents[side], dists[side]
+            other_dist = dists[1 - side]
+            best = None
+            nxt = self.layer()
+            for i in frontiers[side]:
+                self.expanded += 1
+                for off in offsets:
+                    j = i + off
+                    if cells[j]:
+                        continue
+                    if j in other_dist:
+                        length = dist[i] + 1 + other_dist[j]
+                        if best is None or length < best[0]:
+                            best = (length, i, j)
+                    if j not in dist:
+                        dist[j] = dist[i] + 1
+                        parent[j] = i
+                        nxt.append(j)
+            if best is not None:
+                _, i, j = best
+                near = self._unwind(parent, i)
+                far = self._unwind(parents[1 - side], j)
+                far.reverse()
+                path = near + far
+                if side == 1:
+                    path.reverse()
+                return path
+            frontiers = (nxt, frontiers[1]) if side == 0 else (frontiers[0], nxt)
+        return []
+
+
+class JumpPointFinder(PathFinder):
+    """
+    Jump-point search for 4-connected grids. Straight runs without forced
+    neighbours are skipped in one jump, so large open rooms only expand
+    their corners; on narrow corridors it degrades to roughly A*.
+    """
+
+    name = "jps"
+
+    def _search(self, maze, start_i, end_i):
+        cells = maze.cells
+        stride = maze.stride
+        er, ec = divmod(end_i, stride)
+
+        def h(i):
+            r, c = divmod(i, stride)
+            return abs(r - er) + abs(c - ec)
+
+        push, pop = self.heappush, self.heappop
+        g = {start_i: 0}
+        parent = {start_i: -1}
+        closed = set()
+        heap = [(h(start_i), 0, start_i)]
+        while heap:
+            _, neg_g, i = pop(heap)
+            if i in closed:
+                continue
+            if i == end_i:
+                return self._expand(self._unwind(parent, i), stride)
+            closed.add(i)
+            self.expanded += 1
+            for d in self._directions(parent[i], i, stride):
+                j = self._jump(cells, i + d, d, end_i, stride)
+                if j == -1 or j in closed:
+                    continue
+                ng = -neg_g + self._span(i, j, stride)
+                if ng < g.get(j, ng + 1):
+                    g[j] = ng
+                    parent[j] = i
+                    push(heap, (ng + h(j), -ng, j))
+        return []
+
+    @staticmethod
+    def _directions(p, i, stride):
+        """Pruned successor directions of i when reached from p."""
+        if p == -1:
+            return (-stride, stride, -1, 1)
+        if p // stride == i // stride:
+            d = 1 if i > p else -1
+            return (d, -stride, stride)
+        d = stride if i > p else -stride
+        return (d, -1, 1)
+
+    @staticmethod
+    def _span(i, j, stride):
+        """Number of steps between two cells on the same row or column."""
+        if i // stride == j // stride:
+            return abs(j - i)
+        return abs(j - i) // stride
+
+    def _jump(self, cells, i, d, goal, stride):
+        """Walk from i in direction d; return the next jump point or -1."""
+        horizontal = d in (-1, 1)
+        side = stride if horizontal else 1
+        while not cells[i]:
+            if i == goal:
+                return i
+            # Forced neighbour: open to the side where the previous cell was blocked
+            if ((not cells[i + side] and cells[i - d + side])
+                    or (not cells[i - side] and cells[i - d - side])):
+                return i
+            if not horizontal and (self._jump(cells, i + 1, 1, goal, stride) != -1
+                                   or self._jump(cells, i - 1, -1, goal, stride) != -1):
+                return i
+            i += d
+        return -1
+
+    def _expand(self, jump_points, stride):
+        """Fill in the straight segments between consecutive jump points."""
+        path = [jump_points[0]]
+        for a, b in zip(jump_points, jump_points[1:]):
+            if a // stride == b // stride:
+                step = 1 if b > a else -1
+            else:
+                step = stride if b > a else -stride
+            path.extend(range(a + step, b + step, step))
+        return path
+
+
+class CorridorFinder(PathFinder):
+    """
+    A* over the maze's corridor graph (junctions, dead ends, start and exit),
+    built once per maze. `expanded` counts graph nodes, not cells.
+    """
+
+    name = "corridor"
+
+    def _search(self, maze, start_i, end_i):
+        graph = maze.corridor_graph()
+        path = graph.path_indices(start_i, end_i, push=self.heappush, pop=self.heappop)
+        self.expanded = graph.expanded
+        if path is None:
+            return BFSFinder()._search(maze, start_i, end_i)
+        return path
+
+
+class TreeFinder(PathFinder):
+    """
+    Walks the unique path of a perfect maze through its TreeIndex, with no
+    search at all; mazes with loops fall back to BFS.
+    """
+
+    name = "tree"
+
+    def find(self, maze, start, end):
+        index = maze.tree_index()
+        if index is None:
+            finder = BFSFinder()
+            path = finder.find(maze, start, end)
+            self.expanded = finder.expanded
+            return path
+        self.expanded = 0
+        return index.path(start, end)
+
+
+STRATEGIES = {
+    finder.name: finder
+    for finder in (BFSFinder, AStarFinder, BidirectionalBFSFinder, JumpPointFinder,
+                   CorridorFinder, TreeFinder)
+}
+
+
+def get_finder(strategy):
+    """Return a PathFinder for a strategy name or pass an instance through."""
+    if isinstance(strategy, PathFinder):
+        return strategy
+    try:
+        return STRATEGIES[strategy]()
+    except KeyError:
+        raise ValueError(f"Unknown pathfinding strategy '{strategy}'. "
+                         f"Available: {', '.join(STRATEGIES)}") from None
@@ -0,0 +1,113 @@
+"""
+Lightweight timing probes for the game's hot paths.
+
+Functions decorated with @probe("name") feed a rolling histogram while
+probes are enabled; when disabled a probe costs one flag test. Probes are
+switched on with enable(), the in-game "Perf" toggle, or the
+LABYRINTHE_PERF=1 environment variable. LABYRINTHE_PERF_DUMP=<file> makes
+the game write the histograms as JSON on exit.
+"""
+import functools
+import json
+import os
+from collections import deque
+from time import perf_counter
+
+WINDOW = 512  # Samples kept per histogram
+
+enabled = bool(os.environ.get("LABYRINTHE_PERF"))
+dump_path = os.environ.get("LABYRINTHE_PERF_DUMP")
+
+_histograms = {}
+
+
+class Histogram:
+    """Rolling window of durations (seconds) with percentile queries."""
+
+    def __init__(self, window=WINDOW):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, seconds):
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+
+    def percentiles(self, *quantiles):
+        """Nearest-rank percentiles (0-100) over the current window."""
+        ordered = sorted(self.samples)
+        if not ordered:
+            return [0.0 for _ in quantiles]
+        n = len(ordered)
+        return [ordered[min(n - 1, max(0, -(-q * n // 100) - 1))] for q in quantiles]
+
+    def summary(self):
+        p50, p95, p99 = self.percentiles(50, 95, 99)
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "p50_ms": p50 * 1000,
+            "p95_ms": p95 * 1000,
+            "p99_ms": p99 * 1000,
+            "max_ms": max(self.samples, default=0.0) * 1000,
+        }
+
+
+def enable():
+    global enabled
+    enabled = True
+
+
+def disable():
+    global enabled
+    enabled = False
+
+
+def reset():
+    _histograms.clear()
+
+
+def record(name, seconds):
+    hist = _histograms.get(name)
+    if hist is None:
+        hist = _histograms[name] = Histogram()
+    hist.add(seconds)
+
+
+def probe(name):
+    """Decorator timing every call of the function into histogram `name`."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return fn(*args, **kwargs)
+            t0 = perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(name, perf_counter() - t0)
+        return wrapper
+    return decorate
+
+
+def snapshot():
+    """Summaries of every histogram, keyed by probe name."""
+    return {name: hist.summary() for name, hist in sorted(_histograms.items())}
+
+
+def format_overlay():
+    """One-line p50/p95/p99 summary for the in-game overlay."""
+    parts = []
+    for name, s in snapshot().items():
+        parts.append(f"{name} {s['p50_ms']:.1f}/{s['p95_ms']:.1f}/{s['p99_ms']:.1f}")
+    return "ms p50/p95/p99: " + " | ".join(parts) if parts else "Perf: aucune mesure"
+
+
+def dump(path=None):
+    """Write the histogram summaries as JSON to path (default: LABYRINTHE_PERF_DUMP)."""
+    path = path or dump_path
+    if not path or not _histograms:
+        return
+    with open(path, "w") as f:
+        json.dump(snapshot(), f, indent=2)
@@ -1,7 +1,11 @@
 
 from turtle import RawTurtle
+from . import perf
+from .renderer import OverlayLayer
 
 class Player:
+    """Turtle view of the player; the game state itself lives in GameCore."""
+
     def __init__(self, maze, screen, cell_size=40):
         self.maze = maze
         self.screen = screen
@@ -15,14 +19,12 @@ class Player:
         
         self.row = 0
         self.col = 0
-        self.move_count = 0
-        self.visited_cells = set()
-        self.trail_turtles = []
+        self.trail = OverlayLayer(screen.getcanvas(), "trail", "#a0d2db")
+        self.trail.size = max(4, cell_size // 6)
         
         # Initialize at start position
         if self.maze.start_pos:
             self.teleport(*self.maze.start_pos)
-            self.visited_cells.add(self.maze.start_pos)
             self.turtle.showturtle()
         else:
             self.turtle.hideturtle()
@@ -47,59 +49,41 @@ class Player:
         y = start_y - (r * self.cell_size) - (self.cell_size // 2)
         return x, y
 
+    @perf.probe("trail_dot")
     def draw_trail_dot(self, r, c):
         """Draw a small dot on a visited cell to show the trail."""
-        self.screen.tracer(0)
-        t = RawTurtle(self.screen)
-        t.hideturtle()
-        t.speed(0)
-        t.penup()
         x, y = self.grid_to_screen(r, c)
-        t.goto(x, y)
-        t.dot(max(4, self.cell_size // 6), "#a0d2db")
-        self.trail_turtles.append(t)
-        self.screen.update()
-        self.screen.tracer(1)
+        self.trail.add((r, c), x, y)
+
+    def jump(self, r, c, trail):
+        """Teleport to (r, c), leaving trail dots on the given cells in one pass."""
+        for cell in trail:
+            x, y = self.grid_to_screen(*cell)
+            self.trail.add(cell, x, y)
+        self.teleport(r, c)
 
     def clear_trail(self):
         """Remove all trail dots."""
-        for t in self.trail_turtles:
-            t.clear()
-            t.hideturtle()
-        self.trail_turtles = []
+        self.trail.clear()
+
+    def destroy(self):
+        """Hide the turtle and delete the trail items from the canvas."""
+        self.turtle.clear()
+        self.turtle.hideturtle()
+        self.trail.destroy()
 
     def move(self, dr, dc):
-        """Attempt to move by (dr, dc)."""
-        new_r = self.row + dr
-        new_c = self.col + dc
-        
-        if not self.maze.is_wall(new_r, new_c):
-            # Calculate heading
-            if dr == -1: self.turtle.setheading(90)  # Up
-            elif dr == 1: self.turtle.setheading(270) # Down
-            elif dc == -1: self.turtle.setheading(180) # Left
-            elif dc == 1: self.turtle.setheading(0)   # Right
-            
-            # Leave trail on current cell before moving
-            self.draw_trail_dot(self.row, self.col)
-            
-            # Move logic
-            self.row = new_r
-            self.col = new_c
-            self.move_count += 1
-            self.visited_cells.add((new_r, new_c))
-            target_x, target_y = self.grid_to_screen(self.row, self.col)
-            
-            self.turtle.goto(target_x, target_y)
-            return True # Moved successfully
-        else:
-            return False # Hit wall
+        """Show a move by (dr, dc); GameCore has already checked it."""
+        # Calculate heading
+        if dr == -1: self.turtle.setheading(90)  # Up
+        elif dr == 1: self.turtle.setheading(270) # Down
+        elif dc == -1: self.turtle.setheading(180) # Left
+        elif dc == 1: self.turtle.setheading(0)   # Right
 
-    def reset_stats(self):
-        """Reset move counter and visited cells."""
-        self.move_count = 0
-        self.visited_cells.clear()
-        self.clear_trail()
-        if self.maze.start_pos:
-            self.visited_cells.add(self.maze.start_pos)
+        # Leave trail on current cell before moving
+        self.draw_trail_dot(self.row, self.col)
 
+        self.row += dr
+        self.col += dc
+        target_x, target_y = self.grid_to_screen(self.row, self.col)
+        self.turtle.goto(target_x, target_y)
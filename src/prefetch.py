@@ -0,0 +1,51 @@
+"""
+Background preparation of the next level.
+
+While a level is played, a single worker thread builds the following one
+(grid, start/end and exit distance field) so that a level transition only
+has to draw. The interpreter's thread switching keeps Tk responsive while
+the worker runs, and handing a Maze across threads needs no pickling.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+
+class LevelPrefetcher:
+    """Keeps at most one level being built ahead of time by build(level)."""
+
+    def __init__(self, build):
+        self.build = build
+        self.level = None
+        self.future = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+
+    def request(self, level):
+        """Start building level in the background (replacing any other request)."""
+        if self.level == level and self.future is not None:
+            return
+        self.cancel()
+        self.level = level
+        self.future = self._executor.submit(self.build, level)
+
+    def take(self, level):
+        """
+        Return the prefetched Maze for level, waiting for it if the worker is
+        still busy, or None if that level was not requested or failed.
+        """
+        if self.level != level or self.future is None:
+            return None
+        future = self.future
+        self.level = self.future = None
+        try:
+            return future.result()
+        except Exception as e:
+            print(f"Level prefetch failed: {e}")
+            return None
+
+    def cancel(self):
+        if self.future is not None:
+            self.future.cancel()
+        self.level = self.future = None
+
+    def shutdown(self):
+        self.cancel()
+        self._executor.shutdown(wait=False)
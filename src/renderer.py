@@ -0,0 +1,402 @@
+from bisect import bisect_right
+from math import isqrt
+from operator import itemgetter
+from tkinter import TclError
+
+# Run fields: [first column, end column (exclusive), cell kind, canvas item]
+_C0, _C1, _KIND, _ITEM = range(4)
+
+
+class MazeRenderer:
+    """
+    Draws the maze straight onto the Tk canvas behind a TurtleScreen.
+    Each horizontal run of cells of the same kind ("wall", "passage",
+    "start", "end" or "fog", the theme keys) is a single rectangle, and the
+    runs of every row are kept so single cells can be recolored later
+    without redrawing the maze. Rectangles are also tagged by kind, so a
+    theme change is one recolor per kind instead of a redraw.
+
+    The maze is drawn in chunks of rows x columns. Normally one chunk covers
+    the whole maze; in viewport mode (mazes larger than the window) chunks
+    are CHUNK cells square, the canvas scrolls to follow the player, and only
+    the chunks in view are drawn. Chunks leaving the view hand their items
+    to a pool that new chunks reuse, so drawing cost depends on the window
+    size rather than the maze size.
+    """
+
+    TAG = "maze"
+    CHUNK = 16
+    KINDS = ("wall", "passage", "start", "end", "fog")
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.maze = None
+        self.theme = None
+        self.cell_size = 0
+        self.origin = (0, 0)  # Canvas coordinates of the maze's top-left corner
+        self.fog = None       # ((r, c), radius) of the visible disc, None without fog
+        self.viewport = False
+        self._chunk = (1, 1)  # Chunk height and width in cells
+        self._chunks = set()  # (chunk row, chunk col) currently drawn
+        self._runs = {}       # (row, chunk col) -> runs sorted by first column
+        self._free = []       # Hidden rectangles ready for reuse
+        self._home_region = None  # Scroll region to restore after viewport mode
+
+    def draw(self, maze, theme, cell_size, fog=None, view=None):
+        """
+        Draw the maze. fog is None or ((r, c), radius): cells outside that
+        disc are drawn with the "fog" color. view is None to draw the whole
+        maze, or ((r, c), width, height) to draw only the chunks of a
+        width x height pixel viewport centered on cell (r, c).
+        """
+        self.clear()
+        self.maze = maze
+        self.theme = theme
+        self.cell_size = cell_size
+        self.fog = fog
+        # Same centering as Player.grid_to_screen (turtle y axis points up)
+        self.origin = (-(maze.cols * cell_size) // 2, -((maze.rows * cell_size) // 2))
+        self.viewport = view is not None
+        if self.viewport:
+            self._chunk = (self.CHUNK, self.CHUNK)
+            self.follow(*view)
+        else:
+            self._restore_view()
+            self._chunk = (max(1, maze.rows), max(1, maze.cols))
+            if maze.rows and maze.cols:
+                self._draw_chunk(0, 0)
+        # Keep the maze under the turtles and trail dots
+        self.canvas.tag_lower(self.TAG)
+
+    def set_theme(self, theme):
+        """Recolor the drawn maze for another theme, one canvas call per kind."""
+        self.theme = theme
+        for kind in self.KINDS:
+            self.canvas.itemconfigure(self._kind_tag(kind), fill=theme[kind])
+
+    def clear(self):
+        self.canvas.delete(self.TAG)
+        self._chunks = set()
+        self._runs = {}
+        self._free = []
+
+    # === Viewport ===
+    def follow(self, center, width, height):
+        """
+        Scroll a width x height pixel view to center on cell center (clamped
+        to the maze), drawing chunks that enter the view and recycling those
+        that leave it. Only meaningful in viewport mode.
+        """
+        if not self.viewport:
+            return
+        maze = self.maze
+        cs = self.cell_size
+        ox, oy = self.origin
+        total_w, total_h = maze.cols * cs, maze.rows * cs
+        # Scroll region: the maze, padded to the window size when smaller
+        pad_x = max(0, width - total_w) // 2
+        pad_y = max(0, height - total_h) // 2
+        region = (ox - pad_x, oy - pad_y, ox + total_w + pad_x, oy + total_h + pad_y)
+        if self._home_region is None:
+            self._home_region = self.canvas.cget("scrollregion")
+        self.canvas.config(scrollregion=region)
+
+        r, c = center
+        x0 = min(max(ox + c * cs + cs // 2 - width // 2, region[0]), region[2] - width)
+        y0 = min(max(oy + r * cs + cs // 2 - height // 2, region[1]), region[3] - height)
+        x0, y0 = max(x0, region[0]), max(y0, region[1])
+        self.canvas.xview_moveto((x0 - region[0]) / (region[2] - region[0]))
+        self.canvas.yview_moveto((y0 - region[1]) / (region[3] - region[1]))
+
+        ch, cw = self._chunk
+        c_lo = max(0, (x0 - ox) // cs) // cw
+        c_hi = min(maze.cols - 1, (x0 + width - ox) // cs) // cw
+        r_lo = max(0, (y0 - oy) // cs) // ch
+        r_hi = min(maze.rows - 1, (y0 + height - oy) // cs) // ch
+        wanted = {(cy, cx) for cy in range(r_lo, r_hi + 1) for cx in range(c_lo, c_hi + 1)}
+        for chunk in self._chunks - wanted:
+            self._recycle_chunk(*chunk)
+        for chunk in sorted(wanted - self._chunks):
+            self._draw_chunk(*chunk)
+            self.canvas.tag_lower(self._chunk_tag(*chunk))
+
+    def _restore_view(self):
+        """Give the canvas back the scroll region the TurtleScreen set up."""
+        if self._home_region is not None:
+            self.canvas.config(scrollregion=self._home_region)
+            self.canvas.xview_moveto(0)
+            self.canvas.yview_moveto(0)
+            self._home_region = None
+
+    def _chunk_tag(self, cy, cx):
+        return f"{self.TAG}_{cy}_{cx}"
+
+    def _kind_tag(self, kind):
+        return f"{self.TAG}_{kind}"
+
+    def _tags(self, r, c0, kind):
+        ch, cw = self._chunk
+        return (self.TAG, self._chunk_tag(r // ch, c0 // cw), self._kind_tag(kind))
+
+    def _chunk_rows(self, cy):
+        ch = self._chunk[0]
+        return range(cy * ch, min(self.maze.rows, (cy + 1) * ch))
+
+    def _draw_chunk(self, cy, cx):
+        cw = self._chunk[1]
+        c_start = cx * cw
+        c_end = min(self.maze.cols, c_start + cw)
+        for r in self._chunk_rows(cy):
+            runs = self._row_runs(r, c_start, c_end)
+            for run in runs:
+                run[_ITEM] = self._create(r, run[_C0], run[_C1], run[_KIND])
+            self._runs[(r, cx)] = runs
+        self._chunks.add((cy, cx))
+
+    def _recycle_chunk(self, cy, cx):
+        """Hide a chunk's rectangles (one canvas call) and pool them."""
+        self.canvas.itemconfigure(self._chunk_tag(cy, cx), state="hidden")
+        for r in self._chunk_rows(cy):
+            self._free.extend(run[_ITEM] for run in self._runs.pop((r, cx)))
+        self._chunks.discard((cy, cx))
+
+    # === Cells ===
+    def visible_span(self, r, fog):
+        """Columns [lo, hi) of row r inside the fog disc (all columns if no fog)."""
+        cols = self.maze.cols
+        if fog is None:
+            return 0, cols
+        (pr, pc), radius = fog
+        dr = r - pr
+        if abs(dr) > radius:
+            return 0, 0
+        w = isqrt(radius * radius - dr * dr)
+        lo = max(0, pc - w)
+        hi = min(cols, pc + w + 1)
+        return (lo, hi) if lo < hi else (0, 0)
+
+    def cell_kind(self, r, c):
+        """Kind of cell (r, c) when it is not hidden by fog."""
+        maze = self.maze
+        if maze.is_wall(r, c):
+            return "wall"
+        if maze.start_pos == (r, c):
+            return "start"
+        if maze.end_pos == (r, c):
+            return "end"
+        return "passage"
+
+    def set_cell(self, r, c, kind):
+        """
+        Recolor a single cell, splitting or merging the runs around it.
+        Cells of chunks that are not drawn are skipped; they get their
+        current kind when their chunk is drawn.
+        """
+        runs = self._runs.get((r, c // self._chunk[1]))
+        if not runs:
+            return
+        k = bisect_right(runs, c, key=itemgetter(_C0)) - 1
+        run = runs[k]
+        if run[_KIND] == kind:
+            return
+        c0, c1, old_kind, item = run
+        if c1 - c0 == 1:
+            run[_KIND] = kind
+            self.canvas.itemconfigure(item, fill=self.theme[kind], tags=self._tags(r, c0, kind))
+            self._merge(r, runs, k)
+            return
+        # Shrink the old run around c, then give c its own rectangle
+        cell = [c, c + 1, kind, None]
+        if c == c0:
+            run[_C0] = c + 1
+            runs.insert(k, cell)
+        elif c == c1 - 1:
+            run[_C1] = c
+            runs.insert(k + 1, cell)
+        else:
+            run[_C1] = c
+            right = [c + 1, c1, old_kind, None]
+            right[_ITEM] = self._create(r, c + 1, c1, old_kind)
+            self.canvas.tag_lower(right[_ITEM])
+            runs[k + 1:k + 1] = [cell, right]
+        self.canvas.coords(item, *self._bounds(r, run[_C0], run[_C1]))
+        cell[_ITEM] = self._create(r, c, c + 1, kind)
+        self.canvas.tag_lower(cell[_ITEM])
+
+    def _merge(self, r, runs, k):
+        """Merge run k with same-kind neighbours so rows do not fragment."""
+        run = runs[k]
+        merged = False
+        if k + 1 < len(runs) and runs[k + 1][_KIND] == run[_KIND]:
+            nxt = runs.pop(k + 1)
+            run[_C1] = nxt[_C1]
+            self.canvas.delete(nxt[_ITEM])
+            merged = True
+        if k > 0 and runs[k - 1][_KIND] == run[_KIND]:
+            prev = runs[k - 1]
+            prev[_C1] = run[_C1]
+            self.canvas.delete(run[_ITEM])
+            runs.pop(k)
+            run = prev
+            merged = True
+        if merged:
+            self.canvas.coords(run[_ITEM], *self._bounds(r, run[_C0], run[_C1]))
+
+    def move_fog(self, center):
+        """
+        Move the fog disc to center, recoloring only the cells that enter
+        or leave it.
+        """
+        if self.fog is None:
+            return
+        old = self.fog
+        new = (center, old[1])
+        self.fog = new
+        radius = old[1]
+        r_min = max(0, min(old[0][0], center[0]) - radius)
+        r_max = min(self.maze.rows - 1, max(old[0][0], center[0]) + radius)
+        for r in range(r_min, r_max + 1):
+            old_lo, old_hi = self.visible_span(r, old)
+            new_lo, new_hi = self.visible_span(r, new)
+            for c in range(old_lo, old_hi):
+                if not new_lo <= c < new_hi:
+                    self.set_cell(r, c, "fog")
+            for c in range(new_lo, new_hi):
+                if not old_lo <= c < old_hi:
+                    self.set_cell(r, c, self.cell_kind(r, c))
+
+    def _row_runs(self, r, c_start, c_end):
+        """Runs of row r between columns [c_start, c_end), cells outside the fog disc fogged."""
+        maze = self.maze
+        lo, hi = self.visible_span(r, self.fog)
+        lo, hi = max(lo, c_start), min(hi, c_end)
+        if lo >= hi:
+            return [[c_start, c_end, "fog", None]]
+        runs = []
+        if lo > c_start:
+            runs.append([c_start, lo, "fog", None])
+        row = maze.row_bytes(r)
+        c = lo
+        while c < hi:
+            wall = row[c]
+            nxt = row.find(b"\x00" if wall else b"\x01", c, hi)
+            if nxt == -1:
+                nxt = hi
+            runs.append([c, nxt, "wall" if wall else "passage", None])
+            c = nxt
+        if hi < c_end:
+            runs.append([hi, c_end, "fog", None])
+        # Start and exit override passage cells
+        for pos, kind in ((maze.start_pos, "start"), (maze.end_pos, "end")):
+            if pos and pos[0] == r and lo <= pos[1] < hi:
+                self._split(runs, pos[1], kind)
+        return runs
+
+    @staticmethod
+    def _split(runs, c, kind):
+        """Give passage cell c its own run of the given kind (no drawing)."""
+        k = bisect_right(runs, c, key=itemgetter(_C0)) - 1
+        c0, c1, old_kind, _ = runs[k]
+        if old_kind != "passage":
+            return
+        pieces = [[c, c + 1, kind, None]]
+        if c > c0:
+            pieces.insert(0, [c0, c, old_kind, None])
+        if c + 1 < c1:
+            pieces.append([c + 1, c1, old_kind, None])
+        runs[k:k + 1] = pieces
+
+    def _bounds(self, r, c0, c1):
+        ox, oy = self.origin
+        cs = self.cell_size
+        return (ox + c0 * cs, oy + r * cs, ox + c1 * cs, oy + (r + 1) * cs)
+
+    def _create(self, r, c0, c1, kind):
+        """A rectangle for a run, taken from the pool when one is free."""
+        tags = self._tags(r, c0, kind)
+        bounds = self._bounds(r, c0, c1)
+        if self._free:
+            item = self._free.pop()
+            self.canvas.coords(item, *bounds)
+            self.canvas.itemconfigure(item, fill=self.theme[kind], state="normal", tags=tags)
+            return item
+        return self.canvas.create_rectangle(
+            *bounds, fill=self.theme[kind], outline="", width=0, tags=tags)
+
+
+class OverlayLayer:
+    """
+    Dots drawn over the maze (trail, hint markers) from a fixed-size pool
+    of canvas items. add() reuses a hidden item or, once the pool is full,
+    recycles the oldest dot; clear() hides every dot with one canvas call.
+    Both are O(1), and a cell that already has a dot is skipped.
+    """
+
+    _count = 0
+
+    def __init__(self, canvas, name, color, capacity=4096):
+        OverlayLayer._count += 1
+        self.canvas = canvas
+        self.tag = f"{name}_{OverlayLayer._count}"
+        self.color = color
+        self.capacity = capacity
+        self.size = 6         # Dot diameter in pixels
+        self._items = []      # Pool of canvas items, one per slot
+        self._slot_cells = [] # Cell last drawn in each slot
+        self._cells = {}      # (r, c) -> slot of its visible dot
+        self._next = 0        # Next slot to (re)use
+
+    def __len__(self):
+        return len(self._cells)
+
+    def __contains__(self, cell):
+        return cell in self._cells
+
+    def add(self, cell, x, y):
+        """Show a dot on cell, centered on turtle coordinates (x, y)."""
+        if cell in self._cells:
+            return
+        slot = self._next
+        self._next = (slot + 1) % self.capacity
+        half = self.size / 2
+        # Turtle y axis points up, the canvas one down
+        bounds = (x - half, -y - half, x + half, -y + half)
+        if slot < len(self._items):
+            item = self._items[slot]
+            old = self._slot_cells[slot]
+            if self._cells.get(old) == slot:
+                del self._cells[old]
+            self._slot_cells[slot] = cell
+            self.canvas.coords(item, *bounds)
+            self.canvas.itemconfigure(item, fill=self.color, state="normal")
+        else:
+            item = self.canvas.create_oval(*bounds, fill=self.color, outline="",
+                                           tags=(self.tag,))
+            # Above the maze, below the turtles drawn after it
+            try:
+                self.canvas.tag_raise(item, MazeRenderer.TAG)
+            except TclError:
+                pass
+            self._items.append(item)
+            self._slot_cells.append(cell)
+        self._cells[cell] = slot
+
+    def set_color(self, color):
+        """Recolor every dot, shown or pooled, with one canvas call."""
+        self.color = color
+        self.canvas.itemconfigure(self.tag, fill=color)
+
+    def clear(self):
+        """Hide every dot; the items stay in the pool for reuse."""
+        if self._cells:
+            self.canvas.itemconfigure(self.tag, state="hidden")
+            self._cells = {}
+        self._next = 0
+
+    def destroy(self):
+        """Delete the pooled items from the canvas."""
+        self.canvas.delete(self.tag)
+        self._items = []
+        self._slot_cells = []
+        self._cells = {}
+        self._next = 0
@@ -0,0 +1,319 @@
+"""
+Compact game replays and their headless verification.
+
+A replay identifies the maze (level, size, seed, algorithm and a hash of
+the cells) and records every move the player made, 2 bits per move, with
+the time since the previous move as a varint in milliseconds, the moves
+after which hints were shown, the elapsed time and the claimed score.
+
+    python -m src.replay verify replays/ --workers 8
+
+re-runs every replay through GameCore with a scripted clock, recomputes
+the score and reports replays that do not reach the exit or whose score
+does not match the claim.
+
+Layout (little-endian):
+    header   magic "LRPL", version, flags, level, rows, cols, seed,
+             maze hash (8 bytes), elapsed ms, claimed score,
+             algorithm name length
+    name     algorithm name (ASCII)
+    moves    varint count, then the moves packed 4 per byte, first move
+             in the low bits (0=up, 1=right, 2=down, 3=left)
+    times    one varint per move: ms since the previous move
+    hints    varint count, then varint gaps between hint move indices
+"""
+import argparse
+import hashlib
+import os
+import struct
+import sys
+import time
+from functools import lru_cache
+from multiprocessing import Pool
+
+MAGIC = b"LRPL"
+VERSION = 1
+SUFFIX = ".rpl"
+MAX_LEVEL = 100  # Highest level a replay may claim (level 100 is 401x411)
+
+FLAG_HAS_SEED = 0x01
+
+_HEADER = struct.Struct("<4sBBHIIq8sIiB")
+
+# Move codes, in Solver.DIRECTIONS order
+DIRECTIONS = ((-1, 0), (0, 1), (1, 0), (0, -1))
+_CODES = {d: k for k, d in enumerate(DIRECTIONS)}
+
+
+def maze_hash(maze):
+    """Short digest of a maze's cells, start and exit."""
+    h = hashlib.sha256(maze.cells)
+    h.update(repr((maze.start_pos, maze.end_pos)).encode("ascii"))
+    return h.digest()[:8]
+
+
+def _put_varint(out, value):
+    while value > 0x7F:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _get_varint(data, offset):
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+class Replay:
+    """One played level: the maze identity, the moves and the claimed result."""
+
+    def __init__(self, level, rows, cols, seed, algorithm, digest,
+                 moves=b"", times=(), hints=(), elapsed_ms=0, score=0):
+        self.level = level
+        self.rows = rows
+        self.cols = cols
+        self.seed = seed
+        self.algorithm = algorithm
+        self.digest = digest
+        self.moves = bytearray(moves)  # Move codes, one per byte in memory
+        self.times = list(times)       # ms since level start of each move
+        self.hints = list(hints)       # Move counts at which hints were shown
+        self.elapsed_ms = elapsed_ms
+        self.score = score
+
+    @classmethod
+    def for_maze(cls, maze, level):
+        return cls(level, maze.rows, maze.cols, maze.seed, maze.algorithm or "", maze_hash(maze))
+
+    def __len__(self):
+        return len(self.moves)
+
+    def record_move(self, dr, dc, ms):
+        self.moves.append(_CODES[(dr, dc)])
+        self.times.append(ms)
+
+    def record_hint(self):
+        self.hints.append(len(self.moves))
+
+    def directions(self):
+        """The moves as (dr, dc) tuples."""
+        return [DIRECTIONS[code] for code in self.moves]
+
+    # === Serialization ===
+    def dumps(self):
+        algorithm = self.algorithm.encode("ascii")
+        flags = FLAG_HAS_SEED if self.seed is not None else 0
+        out = bytearray(_HEADER.pack(
+            MAGIC, VERSION, flags, self.level, self.rows, self.cols,
+            self.seed if self.seed is not None else 0, self.digest,
+            self.elapsed_ms, self.score, len(algorithm)))
+        out += algorithm
+
+        moves = self.moves
+        _put_varint(out, len(moves))
+        packed = bytearray((len(moves) + 3) // 4)
+        for k, code in enumerate(moves):
+            packed[k >> 2] |= code << ((k & 3) * 2)
+        out += packed
+
+        previous = 0
+        for ms in self.times:
+            _put_varint(out, ms - previous)
+            previous = ms
+        _put_varint(out, len(self.hints))
+        previous = 0
+        for index in self.hints:
+            _put_varint(out, index - previous)
+            previous = index
+        return bytes(out)
+
+    @classmethod
+    def loads(cls, data):
+        data = memoryview(data)
+        if len(data) < _HEADER.size:
+            raise ValueError("Replay data is truncated.")
+        (magic, version, flags, level, rows, cols, seed, digest,
+         elapsed_ms, score, name_len) = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Not a replay file.")
+        if version != VERSION:
+            raise ValueError(f"Unsupported replay version {version}.")
+        offset = _HEADER.size
+        algorithm = bytes(data[offset:offset + name_len]).decode("ascii")
+        offset += name_len
+
+        try:
+            count, offset = _get_varint(data, offset)
+            packed = data[offset:offset + (count + 3) // 4]
+            offset += len(packed)
+            moves = bytearray(count)
+            for k in range(count):
+                moves[k] = (packed[k >> 2] >> ((k & 3) * 2)) & 3
+            times = []
+            ms = 0
+            for _ in range(count):
+                delta, offset = _get_varint(data, offset)
+                ms += delta
+                times.append(ms)
+            n_hints, offset = _get_varint(data, offset)
+            hints = []
+            index = 0
+            for _ in range(n_hints):
+                gap, offset = _get_varint(data, offset)
+                index += gap
+                hints.append(index)
+        except IndexError:
+            raise ValueError("Replay data is truncated.") from None
+        return cls(level, rows, cols, seed if flags & FLAG_HAS_SEED else None,
+                   algorithm, bytes(digest), moves, times, hints, elapsed_ms, score)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.dumps())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.loads(f.read())
+
+    # === Verification ===
+    def build_maze(self):
+        """Regenerate the replay's maze from its seed (None without a seed)."""
+        if self.seed is None:
+            return None
+        return _generated_maze(self.rows, self.cols, self.seed, self.algorithm)
+
+    def verify(self):
+        """
+        Replay the moves headless and recompute the score.
+        Returns (ok, score, reason): reason explains a failed check.
+        """
+        from .core import GameCore
+        from .generator import MazeGenerator
+
+        # Check the header before generating anything: it sets the maze size
+        if self.seed is None:
+            return False, None, "maze has no seed"
+        if not 1 <= self.level <= MAX_LEVEL:
+            return False, None, f"level {self.level} out of range"
+        # The score scales with the level: the maze must be that level's size
+        if (self.rows, self.cols) != MazeGenerator.difficulty_settings(self.level):
+            return False, None, f"maze size does not match level {self.level}"
+        if self.algorithm and self.algorithm not in MazeGenerator.ALGORITHMS:
+            return False, None, f"unknown maze algorithm '{self.algorithm}'"
+        maze = self.build_maze()
+        if maze_hash(maze) != self.digest:
+            return False, None, "maze does not match"
+        if len(self.times) != len(self.moves):
+            return False, None, "times do not match moves"
+        if any(b < a for a, b in zip(self.times, self.times[1:])):
+            return False, None, "times go backwards"
+        if self.times and self.times[-1] > self.elapsed_ms:
+            return False, None, "moves after the end of the level"
+
+        now = [0.0]
+        core = GameCore(clock=lambda: now[0])
+        core.current_level = self.level
+        core.maze = maze
+        core.start_level()
+        hints = iter(self.hints)
+        next_hint = next(hints, None)
+        for k, (dr, dc) in enumerate(self.directions()):
+            while next_hint is not None and next_hint <= k:
+                core.hints_used += 1
+                next_hint = next(hints, None)
+            if core.game_won:
+                return False, None, f"move {k} after reaching the exit"
+            now[0] = self.times[k] / 1000
+            if not core.move(dr, dc):
+                return False, None, f"move {k} runs into a wall"
+            if maze.is_exit(core.row, core.col):
+                break
+        while next_hint is not None:
+            core.hints_used += 1
+            next_hint = next(hints, None)
+        if len(self.moves) != core.move_count:
+            return False, None, "moves after reaching the exit"
+        now[0] = self.elapsed_ms / 1000
+        if not core.check_win():
+            return False, None, "exit not reached"
+        if core.last_score != self.score:
+            return False, core.last_score, f"score {self.score} claimed, {core.last_score} earned"
+        return True, core.last_score, ""
+
+
+@lru_cache(maxsize=64)
+def _generated_maze(rows, cols, seed, algorithm):
+    # Replays of the same level set share mazes; a worker builds each once
+    from .generator import MazeGenerator
+    from .maze import Maze
+
+    grid, start_pos, end_pos = MazeGenerator.generate(rows, cols, seed=seed,
+                                                      algorithm=algorithm or "backtracker")
+    maze = Maze(grid=grid, start_pos=start_pos, end_pos=end_pos)
+    maze.seed = seed
+    maze.algorithm = algorithm
+    return maze
+
+
+def verify_file(path):
+    """Worker: verify one replay file. Returns (path, ok, score, reason)."""
+    # A bad submission is reported, it must not abort the whole batch
+    try:
+        ok, score, reason = Replay.load(path).verify()
+    except Exception as e:
+        return path, False, None, str(e)
+    return path, ok, score, reason
+
+
+def verify_batch(paths, workers=None):
+    """Verify replay files across a process pool; yields results as they finish."""
+    paths = list(paths)
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(paths) // (workers * 16))
+    with Pool(workers) as pool:
+        yield from pool.imap_unordered(verify_file, paths, chunksize)
+
+
+def _collect(targets):
+    for target in targets:
+        if os.path.isdir(target):
+            for name in sorted(os.listdir(target)):
+                if name.endswith(SUFFIX):
+                    yield os.path.join(target, name)
+        else:
+            yield target
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay tools.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    verify = sub.add_parser("verify", help="re-run replays and check their scores")
+    verify.add_argument("paths", nargs="+", help="replay files or directories")
+    verify.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    verify.add_argument("--quiet", action="store_true", help="only print failures")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    total = failed = 0
+    for path, ok, score, reason in verify_batch(_collect(args.paths), args.workers):
+        total += 1
+        if not ok:
+            failed += 1
+            print(f"FAIL {path}: {reason}")
+        elif not args.quiet:
+            print(f"ok   {path}: {score}")
+    elapsed = time.perf_counter() - t0
+    print(f"{total - failed}/{total} replays verified in {elapsed:.2f}s", file=sys.stderr)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,46 +1,115 @@
+class Solver:
+    """
+    Depth-first maze explorer driven by an explicit stack.
+    Each call to step() does O(1) work and returns one move, so the search
+    can be paused, resumed and snapshotted at any point, whatever the depth.
+    """
 
-import time
+    # Directions: Up, Right, Down, Left
+    DIRECTIONS = [(-1, 0), (0, 1), (1, 0), (0, -1)]
 
-class Solver:
     def __init__(self, maze):
         self.maze = maze
-        self.visited = set()
-        self.path_stack = []
+        self.paused = False
+        self.finished = True
+        stride = maze.stride
+        self._offsets = [dr * stride + dc for dr, dc in self.DIRECTIONS]
+        self._exit = maze.index(*maze.end_pos) if maze.end_pos else -1
+        self._frames = []   # Flat indices of the cells on the current DFS path
+        self._next_dir = [] # Next direction to try for each frame
+        self._seen = bytearray(len(maze.cells))
+
+    def reset(self, start_pos):
+        """Start a new exploration from start_pos."""
+        start = self.maze.index(*start_pos)
+        self._seen = bytearray(len(self.maze.cells))
+        self._seen[start] = 1
+        self._frames = [start]
+        self._next_dir = [0]
+        self.finished = False
+        self.paused = False
 
     def solve_generator(self, start_pos):
         """
         Yields moves to solve the maze.
         Each yield is a direction tuple (dr, dc) to move the turtle.
         """
-        self.visited = set()
-        self.path_stack = [start_pos]
-        self.visited.add(start_pos)
-        
-        # We start recursion from the current position
-        # Using an iterative stack or generator for DFS to be "pausable"
-        
-        # Helper generator for recursive DFS
-        yield from self._dfs(start_pos[0], start_pos[1])
-
-    def _dfs(self, r, c):
-        if self.maze.is_exit(r, c):
-            return True
-
-        # Directions: Up, Right, Down, Left
-        directions = [(-1, 0), (0, 1), (1, 0), (0, -1)]
-        
-        for dr, dc in directions:
-            nr, nc = r + dr, c + dc
-            if not self.maze.is_wall(nr, nc) and (nr, nc) not in self.visited:
-                self.visited.add((nr, nc))
-                
-                # Move Forward
-                yield (dr, dc)
-                
-                if (yield from self._dfs(nr, nc)):
-                    return True
-                
-                # Backtrack
-                yield (-dr, -dc)
-        
-        return False
+        self.reset(start_pos)
+        while True:
+            move = self.step()
+            if move is None:
+                return
+            yield move
+
+    def step(self):
+        """Return the next move (dr, dc), or None once the search is over."""
+        if self.finished:
+            return None
+        frames = self._frames
+        next_dir = self._next_dir
+        cells = self.maze.cells
+        seen = self._seen
+        while frames:
+            i = frames[-1]
+            if i == self._exit:
+                break
+            k = next_dir[-1]
+            while k < 4:
+                j = i + self._offsets[k]
+                k += 1
+                if not cells[j] and not seen[j]:
+                    seen[j] = 1
+                    next_dir[-1] = k
+                    frames.append(j)
+                    next_dir.append(0)
+                    # Move Forward
+                    return self.DIRECTIONS[k - 1]
+            # Dead end: backtrack along the direction we came from
+            frames.pop()
+            next_dir.pop()
+            if frames:
+                dr, dc = self.DIRECTIONS[next_dir[-1] - 1]
+                return (-dr, -dc)
+        self.finished = True
+        return None
+
+    # === Pause / resume ===
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+
+    # === State ===
+    @property
+    def position(self):
+        """Current (r, c) of the explorer, None before reset()."""
+        if not self._frames:
+            return None
+        return self.maze.position(self._frames[-1])
+
+    @property
+    def path(self):
+        """Current DFS path from the start as a list of (r, c)."""
+        return [self.maze.position(i) for i in self._frames]
+
+    @property
+    def visited(self):
+        """Set of (r, c) cells explored so far."""
+        seen = self._seen
+        return {self.maze.position(i) for i in range(len(seen)) if seen[i]}
+
+    def snapshot(self):
+        """Capture the search state; pass it to restore() to resume from here."""
+        return {
+            "frames": list(self._frames),
+            "next_dir": list(self._next_dir),
+            "seen": bytes(self._seen),
+            "finished": self.finished,
+        }
+
+    def restore(self, snapshot):
+        self._frames = list(snapshot["frames"])
+        self._next_dir = list(snapshot["next_dir"])
+        self._seen = bytearray(snapshot["seen"])
+        self.finished = snapshot["finished"]
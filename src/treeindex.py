@@ -0,0 +1,132 @@
+"""
+Tree index for perfect mazes.
+
+A maze whose open cells form a tree (every maze from MazeGenerator) has
+exactly one path between two cells. TreeIndex roots that tree, at the exit
+when there is one, and stores each cell's depth plus binary-lifting
+ancestor tables, so distances take O(log n) and paths O(path length)
+without any search. build() returns None for mazes with loops or several
+components, which must keep using a search.
+"""
+from array import array
+
+
+class TreeIndex:
+    def __init__(self, maze, root, order, parent, depth):
+        self.maze = maze
+        self.root = root
+        # Flat cell index -> compact node id (-1 for walls), and back
+        self.node_of = array('i', [-1]) * len(maze.cells)
+        for n, i in enumerate(order):
+            self.node_of[i] = n
+        self.cell_of = order
+        self.depth = depth
+        # up[k][n] = ancestor 2**k levels above node n (the root is its own parent)
+        self.up = [parent]
+        max_depth = max(depth, default=0)
+        while (1 << len(self.up)) <= max_depth:
+            prev = self.up[-1]
+            self.up.append(array('i', map(prev.__getitem__, prev)))
+
+    @classmethod
+    def build(cls, maze):
+        """Index maze's open cells, or return None if they do not form one tree."""
+        cells = maze.cells
+        offsets = maze.neighbor_offsets
+        if maze.end_pos is not None and not maze.is_wall(*maze.end_pos):
+            root = maze.index(*maze.end_pos)
+        else:
+            root = cells.find(0)
+            if root == -1:
+                return None
+
+        # BFS from the root; meeting an already seen cell other than the
+        # parent means there is a loop
+        order = array('i', [root])
+        parent = array('i', [0])
+        depth = array('i', [0])
+        seen = bytearray(cells)
+        seen[root] = 1
+        head = 0
+        while head < len(order):
+            i = order[head]
+            p = order[parent[head]]
+            d = depth[head] + 1
+            for off in offsets:
+                j = i + off
+                if j == p or cells[j]:
+                    continue
+                if seen[j]:
+                    return None
+                seen[j] = 1
+                order.append(j)
+                parent.append(head)
+                depth.append(d)
+            head += 1
+        if len(order) != cells.count(0):
+            return None  # Open cells unreachable from the root
+        return cls(maze, root, order, parent, depth)
+
+    def _lca(self, a, b):
+        """Lowest common ancestor of two node ids."""
+        depth, up = self.depth, self.up
+        if depth[a] < depth[b]:
+            a, b = b, a
+        diff = depth[a] - depth[b]
+        k = 0
+        while diff:
+            if diff & 1:
+                a = up[k][a]
+            diff >>= 1
+            k += 1
+        if a == b:
+            return a
+        for k in range(len(up) - 1, -1, -1):
+            if up[k][a] != up[k][b]:
+                a, b = up[k][a], up[k][b]
+        return up[0][a]
+
+    def _node(self, pos):
+        r, c = pos
+        maze = self.maze
+        if not (0 <= r < maze.rows and 0 <= c < maze.cols):
+            return -1
+        return self.node_of[maze.index(r, c)]
+
+    def distance(self, a, b):
+        """Number of steps between two (r,c) cells, -1 if one is a wall."""
+        na, nb = self._node(a), self._node(b)
+        if na < 0 or nb < 0:
+            return -1
+        depth = self.depth
+        return depth[na] + depth[nb] - 2 * depth[self._lca(na, nb)]
+
+    def path(self, a, b, limit=None):
+        """The path from a to b as a list of (r,c), at most limit cells long."""
+        na, nb = self._node(a), self._node(b)
+        if na < 0 or nb < 0:
+            return []
+        parent = self.up[0]
+        position = self.maze.position
+        cell_of = self.cell_of
+        lca = self._lca(na, nb)
+        limit = self.distance(a, b) + 1 if limit is None else limit
+
+        path = []
+        n = na
+        while n != lca and len(path) < limit:
+            path.append(position(cell_of[n]))
+            n = parent[n]
+        if len(path) >= limit:
+            return path
+        down = []
+        n = nb
+        while n != lca:
+            down.append(n)
+            n = parent[n]
+        down.append(lca)
+        for n in reversed(down):
+            if len(path) >= limit:
+                break
+            path.append(position(cell_of[n]))
+        return path
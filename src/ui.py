@@ -1,7 +1,9 @@
 
 import tkinter as tk
 from tkinter import ttk
-from turtle import TurtleScreen, RawTurtle
+from turtle import TurtleScreen
+from . import perf
+from .renderer import MazeRenderer, OverlayLayer
 
 # Theme definitions: wall, passage, start, end, bg, accent
 THEMES = {
@@ -27,18 +29,34 @@ THEMES = {
     },
 }
 
+# Auto-solve playback: one move per tick, several moves per frame,
+# finish within a fixed time, or explore headless and draw the result
+SOLVE_MODES = ("Normal", "Turbo", "Chrono", "Instantane")
+
+# Replay playback speeds
+REPLAY_SPEEDS = ("x1", "x2", "x5", "x20", "x100")
+
+MIN_CELL_SIZE = 8        # Smallest cell drawn when fitting the whole maze
+VIEWPORT_CELL_SIZE = 16  # Cell size of the scrolling viewport
+
 
 class GameUI:
-    def __init__(self, root, game_instance):
+    def __init__(self, root, game_instance, canvas=None, screen=None):
         self.root = root
         self.game = game_instance
         self.cell_size = 40
         self.current_theme = "Classique"
         self.fog_enabled = False
         self.fog_radius = 3
-        self.hint_turtles = []
+        self.viewport = False
+        self.hint_layer = None
+        self.path_layer = None
         self.fog_turtles = []
-        self.drawer = None
+        self.renderer = None
+        if canvas is not None:
+            # Offscreen (benchmarks): draw on the given canvas, no window or widgets
+            self.setup_drawing(canvas, screen)
+            return
         self.setup_window()
         self.setup_widgets()
         
@@ -67,6 +85,11 @@ class GameUI:
                                      bg="#2980b9", fg="white", font=btn_font, relief="flat", cursor="hand2")
         self.btn_explore.pack(side=tk.LEFT, **btn_pad)
 
+        self.solve_mode_var = tk.StringVar(value=SOLVE_MODES[0])
+        self.solve_mode_combo = ttk.Combobox(self.frame_top, textvariable=self.solve_mode_var,
+                                             values=SOLVE_MODES, state="readonly", width=10)
+        self.solve_mode_combo.pack(side=tk.LEFT, padx=2, pady=6)
+
         self.btn_hint = tk.Button(self.frame_top, text="Indice", command=self.game.show_hint,
                                   bg="#f39c12", fg="white", font=btn_font, relief="flat", cursor="hand2")
         self.btn_hint.pack(side=tk.LEFT, **btn_pad)
@@ -75,6 +98,14 @@ class GameUI:
                                       bg="#8e44ad", fg="white", font=btn_font, relief="flat", cursor="hand2")
         self.btn_new_maze.pack(side=tk.LEFT, **btn_pad)
 
+        self.btn_replay = tk.Button(self.frame_top, text="Revoir", command=self.game.play_replay,
+                                    bg="#16a085", fg="white", font=btn_font, relief="flat", cursor="hand2")
+        self.btn_replay.pack(side=tk.LEFT, **btn_pad)
+        self.replay_speed_var = tk.StringVar(value=REPLAY_SPEEDS[0])
+        self.replay_speed_combo = ttk.Combobox(self.frame_top, textvariable=self.replay_speed_var,
+                                               values=REPLAY_SPEEDS, state="readonly", width=5)
+        self.replay_speed_combo.pack(side=tk.LEFT, padx=2, pady=6)
+
         # Fog of war toggle
         self.fog_var = tk.BooleanVar(value=False)
         self.chk_fog = tk.Checkbutton(self.frame_top, text="Brouillard", variable=self.fog_var,
@@ -83,6 +114,14 @@ class GameUI:
                                        activebackground="#34495e", activeforeground="white")
         self.chk_fog.pack(side=tk.LEFT, **btn_pad)
 
+        # Performance overlay toggle
+        self.perf_var = tk.BooleanVar(value=perf.enabled)
+        self.chk_perf = tk.Checkbutton(self.frame_top, text="Perf", variable=self.perf_var,
+                                        command=self.toggle_perf, bg="#34495e", fg="white",
+                                        selectcolor="#2c3e50", font=("Segoe UI", 10),
+                                        activebackground="#34495e", activeforeground="white")
+        self.chk_perf.pack(side=tk.LEFT, **btn_pad)
+
         # Theme selector
         tk.Label(self.frame_top, text="Theme:", bg="#34495e", fg="white",
                  font=("Segoe UI", 10)).pack(side=tk.LEFT, padx=(10, 2))
@@ -108,11 +147,9 @@ class GameUI:
         self.frame_canvas = tk.Frame(self.root, bg="#2c3e50")
         self.frame_canvas.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
 
-        self.canvas = tk.Canvas(self.frame_canvas, width=900, height=550, highlightthickness=0)
-        self.canvas.pack(fill=tk.BOTH, expand=True)
-        
-        self.screen = TurtleScreen(self.canvas)
-        self.screen.bgcolor(THEMES[self.current_theme]["bg"])
+        canvas = tk.Canvas(self.frame_canvas, width=900, height=550, highlightthickness=0)
+        canvas.pack(fill=tk.BOTH, expand=True)
+        self.setup_drawing(canvas, TurtleScreen(canvas))
         
         # === Bottom Frame: Stats ===
         self.frame_bottom = tk.Frame(self.root, bg="#34495e", height=60)
@@ -140,18 +177,64 @@ class GameUI:
                                   bg="#34495e", fg="#e67e22", font=stats_font)
         self.lbl_level.pack(side=tk.RIGHT, padx=15, pady=8)
 
+        # Probe percentiles, shown under the stats while probes are enabled
+        self.lbl_perf = tk.Label(self.frame_bottom, text="", bg="#34495e", fg="#95a5a6",
+                                 font=("Consolas", 9), anchor="w")
+        if perf.enabled:
+            self.show_perf_overlay()
+
+    def setup_drawing(self, canvas, screen):
+        """Renderer and overlay layers drawing on canvas."""
+        self.canvas = canvas
+        self.screen = screen
+        self.screen.bgcolor(THEMES[self.current_theme]["bg"])
+        self.renderer = MazeRenderer(self.canvas)
+        self.hint_layer = OverlayLayer(self.canvas, "hint", THEMES[self.current_theme]["hint"],
+                                       capacity=64)
+        self.path_layer = OverlayLayer(self.canvas, "path", THEMES[self.current_theme]["accent"])
+
+    def replay_speed(self):
+        """Selected replay speed factor."""
+        return int(self.replay_speed_var.get().lstrip("x"))
+
     def get_theme(self):
         return THEMES.get(self.current_theme, THEMES["Classique"])
 
     def on_theme_change(self, event=None):
         self.current_theme = self.theme_var.get()
-        self.game.redraw_current_maze()
+        if self.renderer.maze is None:
+            self.game.redraw_current_maze()
+            return
+        # Recolor the drawn maze in place: no redraw, the player is kept
+        theme = self.get_theme()
+        self.screen.bgcolor(theme["bg"])
+        self.renderer.set_theme(theme)
+        self.hint_layer.set_color(theme["hint"])
+        self.path_layer.set_color(theme["accent"])
 
     def toggle_fog(self):
         self.fog_enabled = self.fog_var.get()
         self.game.redraw_current_maze()
 
-    def calculate_cell_size(self, maze):
+    def toggle_perf(self):
+        if self.perf_var.get():
+            perf.enable()
+            self.show_perf_overlay()
+            self.update_perf()
+        else:
+            perf.disable()
+            self.lbl_perf.pack_forget()
+
+    def show_perf_overlay(self):
+        # Packed ahead of the stat labels so it gets a full-width row of its own
+        self.lbl_perf.pack(side=tk.BOTTOM, fill=tk.X, padx=15, before=self.lbl_status)
+
+    def update_perf(self):
+        if perf.enabled:
+            self.lbl_perf.config(text=perf.format_overlay())
+
+    def canvas_size(self):
+        """Current canvas size in pixels (900x550 before the window is mapped)."""
         cw = 900
         ch = 550
         try:
@@ -162,6 +245,10 @@ class GameUI:
                  ch = 550
         except:
             pass
+        return cw, ch
+
+    def calculate_cell_size(self, maze):
+        cw, ch = self.canvas_size()
             
         max_w = cw - 40
         max_h = ch - 40
@@ -170,105 +257,60 @@ class GameUI:
         size_h = max_h // maze.rows
         
         self.cell_size = min(size_w, size_h, 40)
-        self.cell_size = max(self.cell_size, 8)
+        # Mazes that do not fit at the minimum size scroll with the player
+        self.viewport = self.cell_size < MIN_CELL_SIZE
+        if self.viewport:
+            self.cell_size = VIEWPORT_CELL_SIZE
 
+    @perf.probe("draw_maze")
     def draw_maze(self, maze, player_pos=None):
         theme = self.get_theme()
-        self.screen.tracer(0)
         self.screen.bgcolor(theme["bg"])
 
         # Clear previous drawings
-        if self.drawer:
-            self.drawer.clear()
         self.clear_fog()
         self.clear_hints()
-
-        self.drawer = RawTurtle(self.screen)
-        self.drawer.hideturtle()
-        self.drawer.speed(0)
-        self.drawer.pensize(1)
-        
-        rows = maze.rows
-        cols = maze.cols
-        
-        total_width = cols * self.cell_size
-        total_height = rows * self.cell_size
-        start_x = -total_width // 2
-        start_y = total_height // 2
-
-        visible = None
-        if self.fog_enabled and player_pos:
-            visible = self._get_visible_cells(player_pos, maze)
-        
-        for r in range(rows):
-            for c in range(cols):
-                val = maze.grid[r][c]
-
-                # Fog of war: hide cells not visible
-                if visible is not None and (r, c) not in visible:
-                    color = theme["fog"]
-                elif val == 1:
-                    color = theme["wall"]
-                elif maze.start_pos == (r, c):
-                    color = theme["start"]
-                elif maze.end_pos == (r, c):
-                    color = theme["end"]
-                else:
-                    color = theme["passage"]
-                
-                x = start_x + (c * self.cell_size)
-                y = start_y - (r * self.cell_size) 
-                
-                self.drawer.penup()
-                self.drawer.goto(x, y)
-                self.drawer.pendown()
-                self.drawer.pencolor(theme["bg"])
-                self.drawer.fillcolor(color)
-                self.drawer.begin_fill()
-                for _ in range(4):
-                    self.drawer.forward(self.cell_size)
-                    self.drawer.right(90)
-                self.drawer.end_fill()
-                
-        self.drawer.penup()
-        self.drawer.hideturtle()
-        self.screen.update()
-        self.screen.tracer(1)
-
-    def _get_visible_cells(self, player_pos, maze):
-        """Return set of (r,c) cells visible from player position within fog_radius."""
-        pr, pc = player_pos
-        visible = set()
-        for dr in range(-self.fog_radius, self.fog_radius + 1):
-            for dc in range(-self.fog_radius, self.fog_radius + 1):
-                if dr * dr + dc * dc <= self.fog_radius * self.fog_radius:
-                    r, c = pr + dr, pc + dc
-                    if 0 <= r < maze.rows and 0 <= c < maze.cols:
-                        visible.add((r, c))
-        return visible
+        self.path_layer.clear()
+
+        center = player_pos or maze.start_pos
+        fog = None
+        if self.fog_enabled and center:
+            fog = (center, self.fog_radius)
+        view = None
+        if self.viewport:
+            view = (center or (0, 0), *self.canvas_size())
+        self.renderer.draw(maze, theme, self.cell_size, fog=fog, view=view)
+
+    def follow_player(self, player_pos):
+        """Scroll the viewport (if any) to keep player_pos centered."""
+        if self.viewport:
+            self.renderer.follow(player_pos, *self.canvas_size())
+
+    def update_fog(self, player_pos):
+        """Move the visible disc to player_pos, recoloring only changed cells."""
+        if self.fog_enabled:
+            self.renderer.move_fog(player_pos)
 
     def draw_hint_path(self, maze, path, player_grid_to_screen):
         """Draw hint markers along the optimal path."""
         self.clear_hints()
-        theme = self.get_theme()
-        self.screen.tracer(0)
+        self.hint_layer.color = self.get_theme()["hint"]
+        self.hint_layer.size = max(6, self.cell_size // 3)
         for r, c in path[1:]:  # Skip current position
-            t = RawTurtle(self.screen)
-            t.hideturtle()
-            t.speed(0)
-            t.penup()
             x, y = player_grid_to_screen(r, c)
-            t.goto(x, y)
-            t.dot(max(6, self.cell_size // 3), theme["hint"])
-            self.hint_turtles.append(t)
-        self.screen.update()
-        self.screen.tracer(1)
+            self.hint_layer.add((r, c), x, y)
+
+    def draw_solution_path(self, path, player_grid_to_screen):
+        """Mark the cells of a solution path in one pass."""
+        self.path_layer.clear()
+        self.path_layer.color = self.get_theme()["accent"]
+        self.path_layer.size = max(4, self.cell_size // 4)
+        for r, c in path:
+            x, y = player_grid_to_screen(r, c)
+            self.path_layer.add((r, c), x, y)
 
     def clear_hints(self):
-        for t in self.hint_turtles:
-            t.clear()
-            t.hideturtle()
-        self.hint_turtles = []
+        self.hint_layer.clear()
 
     def clear_fog(self):
         for t in self.fog_turtles: